@@ -0,0 +1,41 @@
+import os
+import sys
+import pytest
+
+NSE_INDIA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nseIndia")
+sys.path.insert(0, NSE_INDIA_DIR)
+
+from NseReplayServer import NseReplayServer, replay_client  # noqa: E402
+
+REPLAY_LATENCY = float(os.environ.get("NSE_REPLAY_LATENCY", "0.005"))
+
+
+@pytest.fixture(scope="session")
+def replay_workdir(tmp_path_factory):
+    # Exporters create their export folder and SQLite stores relative to the working directory here;
+    # both the directory change and the output format are undone at the end of the session
+    workdir = tmp_path_factory.mktemp("nse_replay")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(workdir)
+        mp.setenv("NSE_OUTPUT_FORMAT", "csv")
+        yield workdir
+
+
+@pytest.fixture(scope="session")
+def replay_server(replay_workdir):
+    with NseReplayServer(latency=REPLAY_LATENCY) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def client(replay_server, replay_workdir):
+    nse_client = replay_client(replay_server, str(replay_workdir / "replayCookies.json"), pool_size=16)
+    nse_client.load_cookies()
+    yield nse_client
+    nse_client.close()
+
+
+@pytest.fixture
+def throttling_server(replay_workdir):
+    with NseReplayServer(latency=REPLAY_LATENCY, throttle_every=3) as server:
+        yield server
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from CorporateFilingsBackfill import CorporateFilingsBackfill, date_windows
+from CorporateFilingsSync import CorporateFilingsSync
+
+
+def test_windows_follow_the_calendar_grid():
+    windows = date_windows(datetime(2026, 1, 20), datetime(2026, 3, 3), window_days=15)
+
+    assert [(w[0].strftime("%m-%d"), w[1].strftime("%m-%d")) for w in windows] == [
+        ("01-16", "01-31"), ("02-01", "02-15"), ("02-16", "02-28"), ("03-01", "03-15"),
+    ]
+    # A range that slides by a day lands on the same windows
+    assert date_windows(datetime(2026, 1, 21), datetime(2026, 3, 4), window_days=15) == windows
+
+
+def test_sliding_range_reuses_checkpoints(client, replay_server, replay_workdir):
+    sync = CorporateFilingsSync(client=client, db_file=str(replay_workdir / "backfillCheckpoints.db"))
+    backfill = CorporateFilingsBackfill(sync=sync, window_days=15, rate_per_sec=1000.0)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today - timedelta(days=90)
+    try:
+        before = replay_server.stats["api_requests"]
+        first = backfill.run("financial-results", start, today)
+        cold_requests = replay_server.stats["api_requests"] - before
+
+        before = replay_server.stats["api_requests"]
+        backfill.run("financial-results", start + timedelta(days=1), today)
+        warm_requests = replay_server.stats["api_requests"] - before
+    finally:
+        backfill.close()
+
+    windows = date_windows(start, today, window_days=15)
+    assert cold_requests == len(windows)
+    # Only the window still open today is fetched again
+    assert warm_requests == sum(1 for w in windows if w[1] >= today)
+    assert first and all(row["filingDate"] for row in first)
@@ -0,0 +1,39 @@
+from HeatmapIndexCache import HeatmapIndexCache
+from getBroad_Sectoral_IndicesNSE_ import NseTestDataExporter
+
+
+def _refresh(exporter, server, force_refresh=False):
+    before = server.stats["api_requests"]
+    broad = {market_index: exporter.broad_market_indices(market_index, force_refresh)
+             for market_index in exporter.marketIndices}
+    gainers = exporter.fetch_all_gainers(broad, force_refresh)
+    return broad, gainers, server.stats["api_requests"] - before
+
+
+def _names(indices_list):
+    return [list(index_info.values())[0] for index_info in indices_list]
+
+
+def test_heatmap_member_cache(client, replay_server, replay_workdir):
+    cache = HeatmapIndexCache(db_file=str(replay_workdir / "heatmapIndexCache.db"))
+    exporter = NseTestDataExporter(client=client, rate_per_sec=1000.0, cache=cache)
+    try:
+        cold_broad, cold_gainers, cold_requests = _refresh(exporter, replay_server)
+        warm_broad, warm_gainers, warm_requests = _refresh(exporter, replay_server)
+        forced_broad, _, forced_requests = _refresh(exporter, replay_server, force_refresh=True)
+    finally:
+        exporter.close()
+
+    # Within the TTL the index list comes from the cache (names only), no heatmap-index calls
+    assert {m: _names(indices) for m, indices in warm_broad.items()} == \
+        {m: _names(indices) for m, indices in cold_broad.items()}
+    assert not any("last" in index_info for indices_list in warm_broad.values() for index_info in indices_list)
+
+    # Same rows both times; the two heatmap-index calls and the index known to have no members are saved
+    assert {market_index: len(rows) for market_index, rows in warm_gainers.items()} == \
+        {market_index: len(rows) for market_index, rows in cold_gainers.items()}
+    assert warm_requests == cold_requests - len(exporter.marketIndices) - 1
+
+    # force_refresh goes back to the live quotes and retries every index
+    assert all("last" in index_info for indices_list in forced_broad.values() for index_info in indices_list)
+    assert forced_requests == cold_requests
@@ -1,68 +1,112 @@
-﻿import time
-import openpyxl
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+﻿import os
+import sys
+import time
+import argparse
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "nseIndia"))
+sys.path.insert(0, os.path.join(REPO_DIR, "SeleniumCommands"))
+
+from getLiveAnalysisVariations import LiveAnalysisVariationsFetcher  # noqa: E402
+from NseOutputSinks import save_frames  # noqa: E402
+from NseSchemas import typed_frame  # noqa: E402
 
 url = "https://www.nseindia.com/market-data/top-gainers-losers"
 
-# ✅ Initialize Excel Workbook
-wb = openpyxl.Workbook()
-gainers_sheet = wb.active
-gainers_sheet.title = "Top Gainers"
-losers_sheet = wb.create_sheet("Top Losers")
-
-def fetch_table_with_headers(driver, table_id):
-    table_data = []
-
-    # Get headers
-    headers = driver.find_elements(By.XPATH, f"//table[@id='{table_id}']/thead/tr/th")
-    header_row = [header.text.strip() for header in headers]
-    table_data.append(header_row)
-
-    # Get rows
-    rows = driver.find_elements(By.XPATH, f"//table[@id='{table_id}']/tbody/tr")
-    for row in rows:
-        cells = row.find_elements(By.TAG_NAME, "td")
-        row_data = [cell.text.strip() for cell in cells]
-        if row_data:
-            table_data.append(row_data)
-
-    return table_data
-
-def save_to_sheet(sheet, data):
-    for row in data:
-        sheet.append(row)
-
-def get_data(tab_id, table_id):
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.implicitly_wait(10)
+# Sheet -> (tab button id, table id, live-analysis-variations direction)
+TABS = {
+    "Top Gainers": ("GAINERS", "topgainer-Table", "gainers"),
+    "Top Losers": ("LOSERS", "toplosers-Table", "loosers"),
+}
+
+# The page shows the NIFTY 50 bucket by default; API field -> page column
+API_COLUMNS = {
+    "symbol": "SYMBOL",
+    "open_price": "OPEN",
+    "high_price": "HIGH",
+    "low_price": "LOW",
+    "prev_price": "PREV. CLOSE",
+    "ltp": "LTP",
+    "perChange": "%CHNG",
+    "trade_quantity": "VOLUME (shares)",
+}
+
+
+def fetch_api(client=None):
+    """Gainers and losers from live-analysis-variations, both fetched at once over the shared client."""
+    fetcher = LiveAnalysisVariationsFetcher(client=client)
+    try:
+        data = fetcher.fetch_data()
+    finally:
+        fetcher.close()
+    tables = {}
+    for sheet, (_, _, direction) in TABS.items():
+        records = ((data.get(direction) or {}).get("NIFTY") or {}).get("data") or []
+        df = typed_frame(records, "live-analysis-variations", columns=list(API_COLUMNS))
+        tables[sheet] = df.rename(columns=API_COLUMNS)
+    return tables
+
+
+def fetch_browser(driver, timeout=15):
+    """Both tabs from one page load on an already running driver."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from TableExtraction import wait_for_table
+
+    wait = WebDriverWait(driver, timeout, poll_frequency=0.2)
     driver.get(url)
-    time.sleep(5)
+    tables = {}
+    for sheet, (tab_id, table_id, _) in TABS.items():
+        wait.until(EC.element_to_be_clickable((By.ID, tab_id))).click()
+        tables[sheet] = wait_for_table(driver, table_id, timeout)
+    return tables
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def print_report(timings, tables):
+    print("\n⏱️ Timing report")
+    fastest = min(timings.values())
+    for name, elapsed in timings.items():
+        rows = sum(len(df) for df in tables[name].values())
+        print(f"   {name:<8} {elapsed:6.2f} s  {rows:4d} rows  ({elapsed / fastest:5.1f}x)")
+
+
+def test_api_path(client):
+    # Timing is covered by the live-analysis-variations case in test_NseReplayBenchmark.py
+    tables = fetch_api(client)
+    assert set(tables) == set(TABS)
+    for df in tables.values():
+        assert len(df) > 0
+        assert list(df.columns) == list(API_COLUMNS.values())
 
-    driver.find_element(By.ID, tab_id).click()
-    time.sleep(2)
 
-    data = fetch_table_with_headers(driver, table_id)
-    driver.quit()
-    return data
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Top gainers/losers via the API and the browser, timed")
+    parser.add_argument("--skip-browser", action="store_true", help="only run the API path")
+    args = parser.parse_args()
 
-# ✅ Execution
-start_time = time.time()
+    timings, tables = {}, {}
+    print("📥 Fetching gainers and losers via the API...")
+    tables["api"], timings["api"] = timed(fetch_api)
 
-print("📈 Getting Gainers Data...")
-gainers_data = get_data("GAINERS", "topgainer-Table")
-save_to_sheet(gainers_sheet, gainers_data)
+    if not args.skip_browser:
+        from getCookiesFromNSEIndia import NseWebDriverService
 
-print("📉 Getting Losers Data...")
-losers_data = get_data("LOSERS", "toplosers-Table")
-save_to_sheet(losers_sheet, losers_data)
+        print("📥 Fetching gainers and losers via the browser...")
+        service = NseWebDriverService.shared()
+        try:
+            tables["browser"], timings["browser"] = timed(fetch_browser, service.get_driver())
+        except Exception as e:
+            print(f"❌ Browser path failed: {e}")
 
-# ✅ Save Excel
-filename = "nse_top_gainers_losers.xlsx"
-wb.save(filename)
-print(f"\n📁 Excel saved as: {filename}")
+    print_report(timings, tables)
 
-end_time = time.time()
-print(f"⏱️ Execution Time: {end_time - start_time:.2f} seconds")
+    filename = "nse_top_gainers_losers.xlsx"
+    paths = save_frames(tables["api"], filename)
+    print(f"\n📁 Saved as: {', '.join(paths)}")
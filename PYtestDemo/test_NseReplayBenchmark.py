@@ -0,0 +1,116 @@
+"""
+Latency/throughput benchmarks of the nseIndia fetchers against the local replay server.
+
+    pytest PYtestDemo/test_NseReplayBenchmark.py --benchmark-autosave
+    pytest PYtestDemo/test_NseReplayBenchmark.py --benchmark-compare --benchmark-compare-fail=mean:20%
+
+The second run fails when any fetcher got more than 20% slower than the saved baseline.
+"""
+import os
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from NseAsyncEngine import AsyncBatchFetcher, TokenBucket  # noqa: E402
+from OptionChainParser import parse_option_chain  # noqa: E402
+from getMarketStatistics import NSEMarketStatisticsExporter  # noqa: E402
+from getMarketSnapshot import NSEMarketSnapshotFetcher  # noqa: E402
+from getOptionChainFetcher import OptionChainFetcher  # noqa: E402
+from getBroad_Sectoral_IndicesNSE_ import NseTestDataExporter  # noqa: E402
+from getLiveAnalysisVariations import LiveAnalysisVariationsFetcher  # noqa: E402
+from getCorporateFilingsAnnouncements import CorporateAnnouncementsFetcher  # noqa: E402
+from getCorporateFilingsActions import CorporateActionsFetcher  # noqa: E402
+from getCorporateFilingsBoardMeetings import CorporateBoardMeetingsFetcher  # noqa: E402
+from getCorporateFilingsFinancialResults import CorporateFinancialResultsFetcher  # noqa: E402
+from getCorporateFilingsShareholdingPattern import CorporateShareHoldingsFetcher  # noqa: E402
+from PreOpenMarketCollector import PreOpenMarketCollector, snapshot_frame, with_deltas  # noqa: E402
+from NseOutputSinks import output_paths  # noqa: E402
+from NseReplayServer import replay_client  # noqa: E402
+
+ROUNDS = 10
+
+
+def _unthrottled(fetcher_class):
+    def build(client):
+        fetcher = fetcher_class(client=client)
+        fetcher.batch_fetcher.limiter = TokenBucket(rate=1000.0)
+        return fetcher
+    return build
+
+
+def _heatmap(fetcher):
+    broad = {market_index: fetcher.broad_market_indices(market_index)
+             for market_index in fetcher.marketIndices}
+    return fetcher.fetch_all_gainers(broad)
+
+
+def _run_and_saved(fetcher):
+    """Production run(); the outputs it left behind (exporters only rewrite them when data changed)."""
+    fetcher.run()
+    return [path for path in output_paths(fetcher.output_file) if os.path.exists(path)]
+
+
+def _financial_results(fetcher):
+    # What run() does, with the backfill's 2 req/s limit lifted
+    return fetcher.backfill(fetcher.from_date, fetcher.to_date, window_days=15, rate_per_sec=1000.0)
+
+
+# name -> (build fetcher from client, one round of the path production runs)
+FETCHERS = {
+    "market-statistics": (NSEMarketStatisticsExporter, lambda f: f.fetch_statistics()),
+    "market-snapshot": (NSEMarketSnapshotFetcher, _run_and_saved),
+    "option-chain": (OptionChainFetcher, lambda f: parse_option_chain(f.fetch_data())),
+    # Rate limits lifted so the benchmark measures the fetch path, not the token bucket
+    "heatmap": (lambda client: NseTestDataExporter(client=client, rate_per_sec=1000.0), _heatmap),
+    "live-analysis-variations": (_unthrottled(LiveAnalysisVariationsFetcher), lambda f: f.to_frames(f.fetch_data())),
+    # Incremental sync against the local filings store, then export when something changed
+    "corporate-announcements": (CorporateAnnouncementsFetcher, _run_and_saved),
+    "corporate-actions": (CorporateActionsFetcher, _run_and_saved),
+    "shareholdings": (CorporateShareHoldingsFetcher, _run_and_saved),
+    "board-meetings": (CorporateBoardMeetingsFetcher, _run_and_saved),
+    "financial-results": (CorporateFinancialResultsFetcher, _financial_results),
+    "pre-open": (_unthrottled(PreOpenMarketCollector),
+                 lambda f: [with_deltas(snapshot_frame(payload, None)) for payload in f.fetch_snapshots().values()]),
+}
+
+
+@pytest.mark.parametrize("name", list(FETCHERS))
+def test_fetcher_latency(benchmark, client, name):
+    build, fetch = FETCHERS[name]
+    fetcher = build(client=client)
+    try:
+        result = benchmark.pedantic(fetch, args=(fetcher,), rounds=ROUNDS, warmup_rounds=1)
+    finally:
+        # Releases the SQLite stores (filings, variations history, heatmap cache, pre-open logs)
+        if hasattr(fetcher, "close"):
+            fetcher.close()
+    assert result is not None and len(result) > 0
+
+
+@pytest.mark.parametrize("concurrency", [1, 8])
+def test_batch_throughput(benchmark, client, concurrency):
+    jobs = [(i, f"/api/heatmap-symbols?type=Broad%20Market%20Indices&indices=INDEX{i}") for i in range(50)]
+    batch = AsyncBatchFetcher(client, max_concurrency=concurrency, rate=1000.0)
+
+    results = benchmark.pedantic(batch.run, args=(jobs,), rounds=3, warmup_rounds=1)
+
+    assert all(error is None for _, _, error in results)
+    # No stats under --benchmark-disable
+    if benchmark.stats is not None:
+        benchmark.extra_info["requests_per_sec"] = len(jobs) / benchmark.stats.stats.mean
+
+
+def test_retries_through_429(benchmark, throttling_server, replay_workdir):
+    throttled_client = replay_client(throttling_server, str(replay_workdir / "throttledCookies.json"))
+    fetcher = NSEMarketStatisticsExporter(client=throttled_client)
+    try:
+        # Three calls per round, so every round (also the single one under --benchmark-disable) meets a 429
+        results = benchmark.pedantic(lambda: [fetcher.fetch_statistics() for _ in range(3)],
+                                     rounds=ROUNDS, warmup_rounds=1)
+    finally:
+        throttled_client.close()
+
+    # Every third API call was a 429, yet each call still returned data after retrying
+    assert all(result["data"]["snapshotCapitalMarket"]["total"] > 0 for result in results)
+    assert throttling_server.stats["throttled"] > 0
+
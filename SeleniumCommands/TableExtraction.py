@@ -0,0 +1,78 @@
+import time
+import pandas as pd
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Serialises a whole <table> in the browser and hands it back in one WebDriver round-trip.
+# Only the last header row is used, so grouped headers above the column names are skipped.
+TABLE_TO_JSON_JS = """
+const table = document.getElementById(arguments[0]);
+if (!table) return null;
+const text = cell => cell.innerText.trim();
+const headerRows = table.querySelectorAll("thead tr");
+const headers = headerRows.length ? Array.from(headerRows[headerRows.length - 1].cells, text) : [];
+const rows = Array.from(table.querySelectorAll("tbody tr"), tr => Array.from(tr.cells, text))
+    .filter(row => row.length >= arguments[1]);
+return {headers: headers, rows: rows};
+"""
+
+
+def read_table(driver, table_id, min_cells=2):
+    """Raw {"headers": [...], "rows": [[...], ...]} of the table, or None when it is not on the page.
+
+    Rows with fewer than `min_cells` cells (placeholders like "No data") are dropped.
+    """
+    return driver.execute_script(TABLE_TO_JSON_JS, table_id, min_cells)
+
+
+def to_dataframe(table):
+    headers = table["headers"]
+    width = max((len(row) for row in table["rows"]), default=len(headers))
+    # Use the header row only when it lines up with the data cells
+    columns = headers if headers and len(headers) == width else None
+    return pd.DataFrame(table["rows"], columns=columns)
+
+
+def extract_table(driver, table_id, min_cells=2):
+    """The table as a DataFrame, read with a single execute_script call."""
+    table = read_table(driver, table_id, min_cells)
+    if table is None:
+        raise ValueError(f"Table #{table_id} not found on {driver.current_url}")
+    return to_dataframe(table)
+
+
+def table_populated(table_id, min_rows=1, min_cells=2):
+    """Wait condition: returns the extracted table once its body has at least `min_rows` rows."""
+    def condition(driver):
+        table = read_table(driver, table_id, min_cells)
+        return table if table and len(table["rows"]) >= min_rows else None
+    return condition
+
+
+def wait_for_table(driver, table_id, timeout=15, min_rows=1, min_cells=2):
+    """Replaces a fixed time.sleep: polls until the table is filled and returns it as a DataFrame."""
+    wait = WebDriverWait(driver, timeout, poll_frequency=0.2)
+    return to_dataframe(wait.until(table_populated(table_id, min_rows, min_cells)))
+
+
+def read_table_per_cell(driver, table_id):
+    """The old way, one find_elements/.text round-trip per cell. Kept for benchmark()."""
+    headers = [th.text.strip() for th in driver.find_elements(By.XPATH, f"//table[@id='{table_id}']/thead/tr/th")]
+    rows = []
+    for row in driver.find_elements(By.XPATH, f"//table[@id='{table_id}']/tbody/tr"):
+        cells = [cell.text.strip() for cell in row.find_elements(By.TAG_NAME, "td")]
+        if len(cells) >= 2:
+            rows.append(cells)
+    return {"headers": headers, "rows": rows}
+
+
+def benchmark(driver, table_id):
+    """Time per-cell scraping against the single execute_script read on the page already loaded."""
+    timings = {}
+    for name, read in (("per-cell", read_table_per_cell), ("bulk", read_table)):
+        start = time.perf_counter()
+        table = read(driver, table_id)
+        timings[name] = time.perf_counter() - start
+        print(f"⏱️ {name:<8} {len(table['rows'])} rows in {timings[name]:.3f} s")
+    print(f"🚀 Bulk read is {timings['per-cell'] / timings['bulk']:.0f}x faster")
+    return timings
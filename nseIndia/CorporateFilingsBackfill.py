@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import pandas as pd
+from NseAsyncEngine import TokenBucket
+from NseOutputSinks import save_frames
+from CorporateFilingsSync import CorporateFilingsSync, FILING_DATASETS, EXPORT_DIR, NSE_DATE_FORMAT
+
+
+def date_windows(start, end, window_days=30):
+    """
+    Split [start, end] (inclusive dates) into windows on a fixed calendar grid.
+
+    Every month is cut into the same slices of about window_days (15 gives the 1st-15th and
+    the 16th-end of month, 30 whole months), so a range that slides by a day maps onto the
+    windows already checkpointed. The first and last window may reach outside [start, end].
+    """
+    slices = max(1, min(30, round(30 / window_days)))
+    step = 30 // slices
+    first_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    windows = []
+    month = first_day.replace(day=1)
+    while month <= end:
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        starts = [month + timedelta(days=k * step) for k in range(slices)]
+        ends = [day - timedelta(days=1) for day in starts[1:]] + [next_month - timedelta(days=1)]
+        windows.extend((s, e) for s, e in zip(starts, ends) if e >= first_day and s <= end)
+        month = next_month
+    return windows
+
+
+class CorporateFilingsBackfill:
+    """
+    Backfill a date range for a corporate filings dataset in small windows.
+
+    Windows are fetched concurrently under a shared rate limit and upserted into the
+    CorporateFilingsSync store as each one completes, so overlapping filings are
+    deduplicated by uid. Finished windows are checkpointed; rerunning an overlapping range
+    only fetches the windows that failed, never ran, or were last fetched before they ended.
+    """
+
+    WINDOWS_TABLE = "corporate_filings_windows"
+    ITEMS_TABLE = "corporate_filings_window_items"
+
+    def __init__(self, sync=None, client=None, window_days=30, max_workers=4, rate_per_sec=2.0):
+        self.sync = sync or CorporateFilingsSync(client=client, timeout=30)
+        self.window_days = window_days
+        self.max_workers = max_workers
+        self.limiter = TokenBucket(rate=rate_per_sec)
+        self._create_tables()
+
+    @property
+    def conn(self):
+        return self.sync.conn
+
+    def _create_tables(self):
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({self.ITEMS_TABLE})")]
+        if columns and "TO_DATE" not in columns:
+            # Checkpoints from before window items were keyed by TO_DATE; the filings themselves are kept
+            print("⚠ Dropping old backfill checkpoints, their windows will be refetched.")
+            self.conn.execute(f"DROP TABLE {self.ITEMS_TABLE}")
+            self.conn.execute(f"DROP TABLE IF EXISTS {self.WINDOWS_TABLE}")
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.WINDOWS_TABLE} (
+                DATASET TEXT NOT NULL,
+                FROM_DATE TEXT NOT NULL,
+                TO_DATE TEXT NOT NULL,
+                ROWS INTEGER NOT NULL,
+                FETCHED_AT TEXT NOT NULL,
+                PRIMARY KEY (DATASET, FROM_DATE, TO_DATE)
+            )
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.ITEMS_TABLE} (
+                DATASET TEXT NOT NULL,
+                FROM_DATE TEXT NOT NULL,
+                TO_DATE TEXT NOT NULL,
+                UID TEXT NOT NULL,
+                PRIMARY KEY (DATASET, FROM_DATE, TO_DATE, UID)
+            )
+        """)
+        self.conn.commit()
+
+    def completed_windows(self, dataset):
+        """(from, to) of the windows fetched after their last day, i.e. that can no longer change."""
+        rows = self.conn.execute(
+            f"SELECT FROM_DATE, TO_DATE FROM {self.WINDOWS_TABLE} "
+            f"WHERE DATASET = ? AND substr(FETCHED_AT, 1, 10) > TO_DATE", (dataset,)
+        ).fetchall()
+        return set(rows)
+
+    def _fetch_window(self, dataset, window):
+        self.limiter.acquire()
+        return self.sync.fetch_window(dataset, *window)
+
+    def _checkpoint(self, dataset, window, records):
+        config = FILING_DATASETS[dataset]
+        from_date, to_date = (day.strftime("%Y-%m-%d") for day in window)
+        uids = {self.sync.filing_uid(record, config) for record in records}
+
+        self.sync.upsert(dataset, records)
+        with self.sync.transaction() as conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {self.ITEMS_TABLE} (DATASET, FROM_DATE, TO_DATE, UID) VALUES (?, ?, ?, ?)",
+                [(dataset, from_date, to_date, uid) for uid in uids],
+            )
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.WINDOWS_TABLE} (DATASET, FROM_DATE, TO_DATE, ROWS, FETCHED_AT) "
+                f"VALUES (?, ?, ?, ?, ?)",
+                (dataset, from_date, to_date, len(records), datetime.now().isoformat(sep=" ", timespec="seconds")),
+            )
+
+    def run(self, dataset, start, end, force=False):
+        """Fetch every pending window of [start, end]; returns the merged, deduplicated filings."""
+        windows = date_windows(start, end, self.window_days)
+        # A window fetched before its last day was still filling up, so it is refetched
+        done = set() if force else self.completed_windows(dataset)
+        pending = [w for w in windows
+                   if (w[0].strftime("%Y-%m-%d"), w[1].strftime("%Y-%m-%d")) not in done]
+        print(f"📅 {dataset}: {start:%d-%m-%Y} to {end:%d-%m-%Y} in {len(windows)} windows, "
+              f"{len(pending)} to fetch")
+
+        started = time.perf_counter()
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._fetch_window, dataset, window): window for window in pending}
+            for future in as_completed(futures):
+                window = futures[future]
+                label = f"{window[0]:%d-%m-%Y}..{window[1]:%d-%m-%Y}"
+                try:
+                    records = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ {dataset} {label} failed: {e}")
+                    continue
+                self._checkpoint(dataset, window, records)
+                print(f"✅ {dataset} {label}: {len(records)} rows")
+
+        print(f"⏱️ {len(pending) - failed}/{len(pending)} windows fetched in {time.perf_counter() - started:.2f}s"
+              + (f", rerun to resume the {failed} failed" if failed else ""))
+        return self.load(dataset, start, end)
+
+    def load(self, dataset, start, end):
+        """Filings filed within [start, end] seen in any checkpointed window overlapping it, each filing once."""
+        first_day = start.strftime("%Y-%m-%d")
+        last_day = end.strftime("%Y-%m-%d")
+        after_last_day = (end + timedelta(days=1)).strftime("%Y-%m-%d")
+        rows = self.conn.execute(f"""
+            SELECT f.PAYLOAD FROM {self.sync.FILINGS_TABLE} f
+            WHERE f.DATASET = ? AND f.UID IN (
+                SELECT i.UID FROM {self.ITEMS_TABLE} i
+                JOIN {self.WINDOWS_TABLE} w
+                    ON w.DATASET = i.DATASET AND w.FROM_DATE = i.FROM_DATE AND w.TO_DATE = i.TO_DATE
+                WHERE i.DATASET = ? AND w.TO_DATE >= ? AND w.FROM_DATE <= ?
+            )
+            AND (f.FILED_AT IS NULL OR (f.FILED_AT >= ? AND f.FILED_AT < ?))
+            ORDER BY f.FILED_AT DESC
+        """, (dataset, dataset, first_day, last_day, first_day, after_last_day))
+        return [json.loads(payload) for (payload,) in rows]
+
+    def close(self):
+        self.sync.close()
+
+
+def backfill_and_save(fetcher, dataset, file_prefix, from_date, to_date,
+                      window_days=30, max_workers=4, rate_per_sec=2.0):
+    """
+    Backfill a "dd-mm-yyyy" range for a fetcher's dataset and save the merged result with
+    the fetcher's own save_to_excel, to <file_prefix>_<from>_to_<to> in its export folder.
+    """
+    start = datetime.strptime(from_date, "%d-%m-%Y")
+    end = datetime.strptime(to_date, "%d-%m-%Y")
+    backfill = CorporateFilingsBackfill(client=fetcher.client, window_days=window_days,
+                                        max_workers=max_workers, rate_per_sec=rate_per_sec)
+    try:
+        records = backfill.run(dataset, start, end)
+    finally:
+        backfill.close()
+
+    fetcher.output_file = os.path.join(fetcher.export_dir, f"{file_prefix}_{from_date}_to_{to_date}.xlsx")
+    fetcher.save_to_excel(records)
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill NSE corporate filings over a date range.")
+    parser.add_argument("dataset", choices=list(FILING_DATASETS))
+    parser.add_argument("from_date", help="dd-mm-yyyy")
+    parser.add_argument("to_date", help="dd-mm-yyyy")
+    parser.add_argument("--window-days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0, help="requests per second")
+    parser.add_argument("--force", action="store_true", help="refetch windows that are already done")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.from_date, NSE_DATE_FORMAT)
+    end = datetime.strptime(args.to_date, NSE_DATE_FORMAT)
+    backfill = CorporateFilingsBackfill(window_days=args.window_days, max_workers=args.workers,
+                                        rate_per_sec=args.rate)
+    try:
+        records = backfill.run(args.dataset, start, end, force=args.force)
+        if records:
+            output_file = os.path.join(EXPORT_DIR, f"{args.dataset}_{args.from_date}_to_{args.to_date}.xlsx")
+            paths = save_frames(pd.DataFrame(records), output_file)
+            print(f"✅ {len(records)} filings saved to {', '.join(paths)}")
+        else:
+            print("⚠ No data to save.")
+    finally:
+        backfill.close()
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from NseClient import NseClient
+
+
+EXPORT_DIR = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
+
+# Dataset -> endpoint, unique key of a filing and the field holding its timestamp.
+# When a listing has no single ID column the key fields are hashed together.
+FILING_DATASETS = {
+    "announcements": {
+        "url": "/api/corporate-announcements?index=equities",
+        "referer": "/companies-listing/corporate-filings-announcements",
+        "key_fields": ("seq_id",),
+        "timestamp_field": "sort_date",
+        "timestamp_format": "%Y-%m-%d %H:%M:%S",
+    },
+    "actions": {
+        "url": "/api/corporates-corporateActions?index=equities",
+        "referer": "/companies-listing/corporate-filings-actions",
+        "key_fields": ("symbol", "series", "subject", "exDate", "recDate"),
+        "timestamp_field": "exDate",
+        "timestamp_format": "%d-%b-%Y",
+        # Listed by ex-date, which is usually weeks after the announcement: look ahead for upcoming ones
+        "forward_days": 90,
+    },
+    "shareholdings": {
+        "url": "/api/corporate-share-holdings-master?index=equities",
+        "referer": "/companies-listing/corporate-filings-shareholding-pattern",
+        "key_fields": ("recordId",),
+        "fallback_key_fields": ("symbol", "date", "submissionDate", "revisionDate"),
+        "timestamp_field": "submissionDate",
+        "timestamp_format": "%d-%b-%Y",
+    },
+    "financial-results": {
+        "url": "/api/corporates-financial-results?index=equities&period=Quarterly",
+        "referer": "/companies-listing/corporate-filings-financial-results?equityfndatefilter=1",
+        "key_fields": ("seqNumber",),
+        "fallback_key_fields": ("symbol", "period", "relatingTo", "consolidated", "audited", "filingDate"),
+        "timestamp_field": "filingDate",
+        "timestamp_format": "%d-%b-%Y %H:%M",
+    },
+    "board-meetings": {
+        "url": "/api/corporate-board-meetings?index=equities",
+        "referer": "/companies-listing/corporate-filings-board-meetings?equitybmdatefilter=1",
+        "key_fields": ("bm_symbol", "bm_date", "bm_purpose", "bm_timestamp"),
+        "timestamp_field": "bm_timestamp",
+        "timestamp_format": "%d-%b-%Y %H:%M:%S",
+    },
+}
+
+NSE_DATE_FORMAT = "%d-%m-%Y"    # from_date / to_date query format
+
+
+class CorporateFilingsSync:
+    """
+    Local SQLite index of corporate filings keyed by (dataset, uid).
+
+    The first sync of a dataset pulls the full listing; afterwards each sync only asks for
+    the window from the last synced day to today (further ahead for datasets listed by a
+    future date, see "forward_days") and upserts it, so polling stays cheap.
+    """
+
+    FILINGS_TABLE = "corporate_filings"
+    STATE_TABLE = "corporate_filings_sync"
+
+    # Serialises writers within the process (the runner fans fetchers out over threads)
+    _write_lock = threading.Lock()
+
+    def __init__(self, client=None, db_file=None, timeout=20):
+        self.client = client or NseClient()
+        self.timeout = timeout
+        if db_file is None:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            db_file = os.path.join(EXPORT_DIR, "CorporateFilings.db")
+        self.db_file = db_file
+
+        self.conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.FILINGS_TABLE} (
+                DATASET TEXT NOT NULL,
+                UID TEXT NOT NULL,
+                FILED_AT TEXT,
+                PAYLOAD TEXT NOT NULL,
+                FIRST_SEEN TEXT NOT NULL,
+                LAST_SEEN TEXT NOT NULL,
+                PRIMARY KEY (DATASET, UID)
+            )
+        """)
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.FILINGS_TABLE}_filed "
+            f"ON {self.FILINGS_TABLE} (DATASET, FILED_AT)"
+        )
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.STATE_TABLE} (
+                DATASET TEXT PRIMARY KEY,
+                HIGH_WATER TEXT,
+                SYNCED_THROUGH TEXT NOT NULL,
+                LAST_SYNC TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def _config(dataset):
+        if dataset not in FILING_DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}. Choose from: {', '.join(FILING_DATASETS)}")
+        return FILING_DATASETS[dataset]
+
+    @staticmethod
+    def filing_uid(record, config):
+        """Filing ID when NSE provides one, otherwise a hash of the identifying fields."""
+        key_fields = config["key_fields"]
+        if not all(record.get(field) not in (None, "") for field in key_fields):
+            key_fields = config.get("fallback_key_fields", key_fields)
+        if len(key_fields) == 1:
+            return str(record.get(key_fields[0]))
+        raw = "|".join(str(record.get(field, "")) for field in key_fields)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def filing_time(record, config):
+        value = record.get(config["timestamp_field"])
+        try:
+            return datetime.strptime(str(value).strip(), config["timestamp_format"]).isoformat(sep=" ")
+        except (TypeError, ValueError):
+            return None
+
+    def sync_state(self, dataset):
+        """(high_water, synced_through) for a dataset, or (None, None) before its first sync."""
+        row = self.conn.execute(
+            f"SELECT HIGH_WATER, SYNCED_THROUGH FROM {self.STATE_TABLE} WHERE DATASET = ?", (dataset,)
+        ).fetchone()
+        return row if row else (None, None)
+
+    def fetch_window(self, dataset, from_date=None, to_date=None):
+        """Filings of one dataset between two dates (None = the full default listing)."""
+        config = self._config(dataset)
+        params = None
+        if from_date is not None:
+            params = {"from_date": from_date.strftime(NSE_DATE_FORMAT),
+                      "to_date": (to_date or datetime.now()).strftime(NSE_DATE_FORMAT)}
+        data = self.client.get_json(config["url"], params=params, referer=config["referer"], timeout=self.timeout)
+        if isinstance(data, dict):
+            data = data.get("data", [])
+        return data if isinstance(data, list) else []
+
+    def upsert(self, dataset, records):
+        """Insert new filings and refresh changed ones; returns how many rows were new or changed."""
+        config = self._config(dataset)
+        now = datetime.now().isoformat(sep=" ", timespec="seconds")
+        rows = [
+            (dataset, self.filing_uid(record, config), self.filing_time(record, config),
+             json.dumps(record, sort_keys=True, default=str), now, now)
+            for record in records
+        ]
+        with self._write_lock:
+            before = self.conn.total_changes
+            self.conn.executemany(f"""
+                INSERT INTO {self.FILINGS_TABLE} (DATASET, UID, FILED_AT, PAYLOAD, FIRST_SEEN, LAST_SEEN)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (DATASET, UID) DO UPDATE SET
+                    FILED_AT = excluded.FILED_AT,
+                    PAYLOAD = excluded.PAYLOAD,
+                    LAST_SEEN = excluded.LAST_SEEN
+                WHERE PAYLOAD != excluded.PAYLOAD
+            """, rows)
+            changed = self.conn.total_changes - before
+            self.conn.commit()
+        return changed
+
+    @contextmanager
+    def transaction(self):
+        """Serialised write transaction on the store's connection, for callers keeping their own tables in it."""
+        with self._write_lock:
+            try:
+                yield self.conn
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def _mark_synced(self, dataset, synced_through):
+        with self._write_lock:
+            self.conn.execute(f"""
+                INSERT INTO {self.STATE_TABLE} (DATASET, HIGH_WATER, SYNCED_THROUGH, LAST_SYNC)
+                VALUES (?, (SELECT MAX(FILED_AT) FROM {self.FILINGS_TABLE} WHERE DATASET = ?), ?, ?)
+                ON CONFLICT (DATASET) DO UPDATE SET
+                    HIGH_WATER = excluded.HIGH_WATER,
+                    SYNCED_THROUGH = excluded.SYNCED_THROUGH,
+                    LAST_SYNC = excluded.LAST_SYNC
+            """, (dataset, dataset, synced_through.strftime("%Y-%m-%d"),
+                  datetime.now().isoformat(sep=" ", timespec="seconds")))
+            self.conn.commit()
+
+    def sync(self, dataset, now=None):
+        """Fetch what is new since the last sync and upsert it. Returns the number of changed filings."""
+        now = now or datetime.now()
+        _, synced_through = self.sync_state(dataset)
+
+        if synced_through is None:
+            print(f"📥 {dataset}: first sync, fetching the full listing...")
+            records = self.fetch_window(dataset)
+        else:
+            # Re-read the last synced day too: filings keep arriving until it is over
+            from_date = datetime.strptime(synced_through, "%Y-%m-%d")
+            to_date = now + timedelta(days=self._config(dataset).get("forward_days", 0))
+            print(f"📥 {dataset}: fetching {from_date:%d-%m-%Y} to {to_date:%d-%m-%Y}...")
+            records = self.fetch_window(dataset, from_date, to_date)
+
+        changed = self.upsert(dataset, records)
+        self._mark_synced(dataset, now)
+        print(f"✅ {dataset}: {len(records)} fetched, {changed} new or updated.")
+        return changed
+
+    def load(self, dataset, since=None, until=None):
+        """Stored filings (newest first) as a list of the original API records."""
+        self._config(dataset)
+        query = f"SELECT PAYLOAD FROM {self.FILINGS_TABLE} WHERE DATASET = ?"
+        params = [dataset]
+        if since is not None:
+            query += " AND FILED_AT >= ?"
+            params.append(str(since))
+        if until is not None:
+            query += " AND FILED_AT <= ?"
+            params.append(str(until))
+        query += " ORDER BY FILED_AT DESC"
+        return [json.loads(payload) for (payload,) in self.conn.execute(query, params)]
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    sync = CorporateFilingsSync()
+    try:
+        for name in FILING_DATASETS:
+            try:
+                sync.sync(name)
+            except Exception as e:
+                print(f"❌ {name} sync failed: {e}")
+    finally:
+        sync.close()
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+
+EXPORT_DIR = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
+
+
+class HeatmapIndexCache:
+    """
+    Persistent cache of heatmap index lists and their constituent symbols.
+
+    These change a few times a year (rebalancing, new indices), unlike the quotes fetched
+    with them, so they are kept in their own SQLite file and trusted for `ttl_hours`.
+    No prices are stored here.
+    """
+
+    INDICES_TABLE = "heatmap_indices"
+    MEMBERS_TABLE = "heatmap_members"
+
+    _write_lock = threading.Lock()
+
+    def __init__(self, db_file=None, ttl_hours=24):
+        if db_file is None:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            db_file = os.path.join(EXPORT_DIR, "HeatmapIndexCache.db")
+        self.db_file = db_file
+        self.ttl = timedelta(hours=ttl_hours)
+
+        self.conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        # One row per index; NAME_FIELD is the payload key the name was read from
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.INDICES_TABLE} (
+                MARKET_INDEX TEXT NOT NULL,
+                POSITION INTEGER NOT NULL,
+                INDEX_NAME TEXT NOT NULL,
+                NAME_FIELD TEXT NOT NULL,
+                FETCHED_AT TEXT NOT NULL,
+                PRIMARY KEY (MARKET_INDEX, POSITION)
+            )
+        """)
+        # MEMBERS holds the symbols newline-separated; an empty string means the index had none
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.MEMBERS_TABLE} (
+                MARKET_INDEX TEXT NOT NULL,
+                INDEX_NAME TEXT NOT NULL,
+                MEMBERS TEXT NOT NULL,
+                FETCHED_AT TEXT NOT NULL,
+                PRIMARY KEY (MARKET_INDEX, INDEX_NAME)
+            )
+        """)
+        self.conn.commit()
+
+    def _fresh_since(self):
+        return (datetime.now() - self.ttl).isoformat(timespec="seconds")
+
+    def index_list(self, market_index, allow_stale=False):
+        """[{name_field: index_name}, ...] as last fetched, or None when missing (or older than the TTL, unless `allow_stale`)."""
+        rows = self.conn.execute(f"""
+            SELECT INDEX_NAME, NAME_FIELD, FETCHED_AT FROM {self.INDICES_TABLE}
+            WHERE MARKET_INDEX = ? ORDER BY POSITION
+        """, (market_index,)).fetchall()
+        if not rows or (not allow_stale and min(row[2] for row in rows) < self._fresh_since()):
+            return None
+        return [{name_field: index_name} for index_name, name_field, _ in rows]
+
+    def save_index_list(self, market_index, indices_list):
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for position, index_info in enumerate(indices_list):
+            name_field, index_name = next(iter(index_info.items()))
+            rows.append((market_index, position, index_name, name_field, fetched_at))
+        with self._write_lock:
+            self.conn.execute(f"DELETE FROM {self.INDICES_TABLE} WHERE MARKET_INDEX = ?", (market_index,))
+            self.conn.executemany(f"""
+                INSERT INTO {self.INDICES_TABLE} (MARKET_INDEX, POSITION, INDEX_NAME, NAME_FIELD, FETCHED_AT)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            self.conn.commit()
+
+    def known_members(self, market_index):
+        """{index_name: [symbols]} for the indices of `market_index` whose members are within the TTL."""
+        rows = self.conn.execute(f"""
+            SELECT INDEX_NAME, MEMBERS FROM {self.MEMBERS_TABLE}
+            WHERE MARKET_INDEX = ? AND FETCHED_AT >= ?
+        """, (market_index, self._fresh_since())).fetchall()
+        return {index_name: members.split("\n") if members else [] for index_name, members in rows}
+
+    def save_members(self, members):
+        """Store {(market_index, index_name): [symbols]} in one transaction."""
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        with self._write_lock:
+            self.conn.executemany(f"""
+                INSERT INTO {self.MEMBERS_TABLE} (MARKET_INDEX, INDEX_NAME, MEMBERS, FETCHED_AT)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (MARKET_INDEX, INDEX_NAME) DO UPDATE SET
+                    MEMBERS = excluded.MEMBERS,
+                    FETCHED_AT = excluded.FETCHED_AT
+            """, [(market_index, index_name, "\n".join(symbols), fetched_at)
+                  for (market_index, index_name), symbols in members.items()])
+            self.conn.commit()
+
+    def invalidate(self, market_index=None):
+        """Drop cached lists and members (all, or one market category) so the next run refetches them."""
+        with self._write_lock:
+            for table in (self.INDICES_TABLE, self.MEMBERS_TABLE):
+                if market_index is None:
+                    self.conn.execute(f"DELETE FROM {table}")
+                else:
+                    self.conn.execute(f"DELETE FROM {table} WHERE MARKET_INDEX = ?", (market_index,))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,215 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+
+
+EXPORT_DIR = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
+
+# Payload key -> sheet name used by the live-analysis-variations exporters
+VARIATION_BUCKETS = {
+    "NIFTY": "NIFTY 50",
+    "BANKNIFTY": "BANK NIFTY",
+    "NIFTYNEXT50": "NIFTY NEXT 50",
+    "FOSec": "F&O Securities",
+}
+
+# Stored numeric column -> field in a live-analysis-variations record
+NUMERIC_FIELDS = {
+    "LTP": "ltp",
+    "PREV_PRICE": "prev_price",
+    "PER_CHANGE": "perChange",
+    "TRADE_QUANTITY": "trade_quantity",
+    "TURNOVER": "turnover",
+}
+
+
+def _number(value):
+    try:
+        return float(str(value).replace(",", "")) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class LiveVariationsHistory:
+    """
+    Append-only SQLite history of live-analysis-variations snapshots (gainers and losers).
+
+    Rows are partitioned by TRADE_DATE and indexed on (DIRECTION, SYMBOL, TRADE_DATE) and
+    (DIRECTION, BUCKET, TRADE_DATE), so rolling-frequency questions such as "how many times
+    was X in the top gainers this week" read an index range instead of scanning the table.
+    """
+
+    SNAPSHOTS_TABLE = "variation_snapshots"
+    ROWS_TABLE = "variation_rows"
+
+    _write_lock = threading.Lock()
+
+    def __init__(self, db_file=None):
+        if db_file is None:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            db_file = os.path.join(EXPORT_DIR, "LiveAnalysisVariationsHistory.db")
+        self.db_file = db_file
+
+        self.conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.SNAPSHOTS_TABLE} (
+                SNAPSHOT_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                TIMESTAMP TEXT NOT NULL,
+                TRADE_DATE TEXT NOT NULL,
+                DIRECTION TEXT NOT NULL
+            )
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.ROWS_TABLE} (
+                SNAPSHOT_ID INTEGER NOT NULL REFERENCES {self.SNAPSHOTS_TABLE} (SNAPSHOT_ID),
+                TRADE_DATE TEXT NOT NULL,
+                DIRECTION TEXT NOT NULL,
+                BUCKET TEXT NOT NULL,
+                RANK INTEGER NOT NULL,
+                SYMBOL TEXT NOT NULL,
+                SERIES TEXT,
+                LTP REAL,
+                PREV_PRICE REAL,
+                PER_CHANGE REAL,
+                TRADE_QUANTITY REAL,
+                TURNOVER REAL,
+                PRIMARY KEY (SNAPSHOT_ID, BUCKET, SYMBOL)
+            )
+        """)
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.SNAPSHOTS_TABLE}_direction "
+            f"ON {self.SNAPSHOTS_TABLE} (DIRECTION, TRADE_DATE)"
+        )
+        # Covering indexes for the frequency queries: the table itself is never touched
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.ROWS_TABLE}_symbol "
+            f"ON {self.ROWS_TABLE} (DIRECTION, SYMBOL, TRADE_DATE, BUCKET, SNAPSHOT_ID)"
+        )
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.ROWS_TABLE}_bucket "
+            f"ON {self.ROWS_TABLE} (DIRECTION, BUCKET, TRADE_DATE, SYMBOL, SNAPSHOT_ID)"
+        )
+        self.conn.commit()
+
+    def append(self, data, direction, timestamp=None):
+        """Store one live-analysis-variations payload; returns the number of rows written."""
+        timestamp = timestamp or datetime.now()
+        trade_date = timestamp.strftime("%Y-%m-%d")
+
+        with self._write_lock:
+            cursor = self.conn.execute(
+                f"INSERT INTO {self.SNAPSHOTS_TABLE} (TIMESTAMP, TRADE_DATE, DIRECTION) VALUES (?, ?, ?)",
+                (timestamp.isoformat(sep=" ", timespec="seconds"), trade_date, direction),
+            )
+            snapshot_id = cursor.lastrowid
+
+            rows = []
+            for bucket in VARIATION_BUCKETS:
+                records = (data.get(bucket) or {}).get("data") or []
+                for rank, record in enumerate(records, start=1):
+                    if not record.get("symbol"):
+                        continue
+                    rows.append((
+                        snapshot_id, trade_date, direction, bucket, rank,
+                        record.get("symbol"), record.get("series"),
+                        *(_number(record.get(field)) for field in NUMERIC_FIELDS.values()),
+                    ))
+            self.conn.executemany(f"""
+                INSERT OR IGNORE INTO {self.ROWS_TABLE}
+                    (SNAPSHOT_ID, TRADE_DATE, DIRECTION, BUCKET, RANK, SYMBOL, SERIES, {", ".join(NUMERIC_FIELDS)})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def _date(value):
+        return value.strftime("%Y-%m-%d") if hasattr(value, "strftime") else str(value)
+
+    def frequency(self, direction="gainers", since=None, until=None, bucket=None, symbol=None):
+        """
+        How often each symbol appeared between two trade dates (inclusive, default the last 7 days).
+        Returns SYMBOL, SNAPSHOTS (appearances), DAYS (distinct trade dates), FIRST_DATE, LAST_DATE.
+        """
+        until = until or datetime.now()
+        since = since or (until - timedelta(days=6))
+        query = f"""
+            SELECT SYMBOL, COUNT(DISTINCT SNAPSHOT_ID) AS SNAPSHOTS, COUNT(DISTINCT TRADE_DATE) AS DAYS,
+                   MIN(TRADE_DATE) AS FIRST_DATE, MAX(TRADE_DATE) AS LAST_DATE
+            FROM {self.ROWS_TABLE}
+            WHERE DIRECTION = ? AND TRADE_DATE BETWEEN ? AND ?
+        """
+        params = [direction, self._date(since), self._date(until)]
+        if bucket is not None:
+            query += " AND BUCKET = ?"
+            params.append(bucket)
+        if symbol is not None:
+            query += " AND SYMBOL = ?"
+            params.append(symbol)
+        query += " GROUP BY SYMBOL ORDER BY SNAPSHOTS DESC, SYMBOL"
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def rolling_frequency(self, symbol, direction="gainers", days=7, bucket=None, until=None):
+        """Number of snapshots in the last `days` trade dates (up to `until`) in which `symbol` appeared."""
+        until = until or datetime.now()
+        # Holidays and weekends have no snapshots, so count back over the dates actually recorded
+        trade_dates = self.conn.execute(f"""
+            SELECT DISTINCT TRADE_DATE FROM {self.SNAPSHOTS_TABLE}
+            WHERE DIRECTION = ? AND TRADE_DATE <= ?
+            ORDER BY TRADE_DATE DESC LIMIT ?
+        """, (direction, self._date(until), days)).fetchall()
+        if not trade_dates:
+            return 0
+        result = self.frequency(direction, trade_dates[-1][0], until, bucket=bucket, symbol=symbol)
+        return int(result["SNAPSHOTS"].iloc[0]) if not result.empty else 0
+
+    def snapshot_count(self, direction="gainers", since=None, until=None):
+        """Snapshots taken in a date range, the denominator for frequencies."""
+        until = until or datetime.now()
+        since = since or (until - timedelta(days=6))
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM {self.SNAPSHOTS_TABLE} WHERE DIRECTION = ? AND TRADE_DATE BETWEEN ? AND ?",
+            (direction, self._date(since), self._date(until)),
+        ).fetchone()[0]
+
+    def load(self, direction=None, since=None, until=None):
+        """Stored rows joined with their snapshot timestamp, oldest first."""
+        query = f"""
+            SELECT s.TIMESTAMP, r.* FROM {self.ROWS_TABLE} r
+            JOIN {self.SNAPSHOTS_TABLE} s ON s.SNAPSHOT_ID = r.SNAPSHOT_ID
+            WHERE 1 = 1
+        """
+        params = []
+        if direction is not None:
+            query += " AND r.DIRECTION = ?"
+            params.append(direction)
+        if since is not None:
+            query += " AND r.TRADE_DATE >= ?"
+            params.append(self._date(since))
+        if until is not None:
+            query += " AND r.TRADE_DATE <= ?"
+            params.append(self._date(until))
+        query += " ORDER BY s.TIMESTAMP, r.BUCKET, r.RANK"
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def close(self):
+        # Refresh planner statistics so date-range queries keep choosing the right index
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    history = LiveVariationsHistory()
+    try:
+        for direction in ("gainers", "loosers"):
+            print(f"📊 {direction}: {history.snapshot_count(direction)} snapshots in the last 7 days")
+            print(history.frequency(direction, bucket="NIFTY").head(10).to_string(index=False))
+    finally:
+        history.close()
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from NseClient import NseClient
+from getMarketStatistics import NSEMarketStatisticsExporter
+from getMarketSnapshot import NSEMarketSnapshotFetcher
+
+
+EXPORT_DIR = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
+
+
+def breadth_rows(data):
+    """Advances/declines breadth from getMarketStatistics as a single row."""
+    snapshot = data["data"]["snapshotCapitalMarket"]
+    return [(
+        data["data"].get("asOnDate"),
+        snapshot.get("total"), snapshot.get("advances"), snapshot.get("declines"), snapshot.get("unchange"),
+    )]
+
+
+def top_gainer_rows(data):
+    """Ranked top gainers from getMarketSnapshot."""
+    return [
+        (rank, row.get("symbol"), row.get("series"), row.get("lastPrice"), row.get("pchange"),
+         row.get("totalTradedVolume"))
+        for rank, row in enumerate(data.get("data", {}).get("topGainers", []), start=1)
+    ]
+
+
+# Feed -> how to extract rows from the payload and where they are stored
+FEEDS = {
+    "breadth": {
+        "fetcher": NSEMarketStatisticsExporter,
+        "extract": breadth_rows,
+        "table": "market_breadth",
+        "columns": {"AS_ON": "TEXT", "TOTAL": "INTEGER", "ADVANCES": "INTEGER",
+                    "DECLINES": "INTEGER", "UNCHANGED": "INTEGER"},
+    },
+    "top-gainers": {
+        "fetcher": NSEMarketSnapshotFetcher,
+        "extract": top_gainer_rows,
+        "table": "market_top_gainers",
+        "columns": {"RANK": "INTEGER", "SYMBOL": "TEXT", "SERIES": "TEXT", "LAST_PRICE": "REAL",
+                    "PCHANGE": "REAL", "TOTAL_TRADED_VOLUME": "INTEGER"},
+    },
+}
+
+
+class MarketSnapshotPoller:
+    """
+    Poll market breadth and top gainers intraday and keep only the changes.
+
+    Each poll sends If-None-Match / If-Modified-Since when NSE returned an ETag or
+    Last-Modified before, so an unchanged resource costs a 304 and no body. When the
+    server ignores those headers, the extracted rows are hashed and a tick is stored
+    only when the hash differs from the previous one.
+    """
+
+    STATE_TABLE = "market_poll_state"
+
+    def __init__(self, feeds=None, interval=60, client=None, db_file=None):
+        self.feeds = list(feeds or FEEDS)
+        self.interval = interval
+        self.client = client or NseClient()
+        # Reuse the endpoint and referer of the one-shot exporters
+        self.endpoints = {}
+        for feed in self.feeds:
+            fetcher = FEEDS[feed]["fetcher"](client=self.client)
+            self.endpoints[feed] = (fetcher.url, fetcher.referer)
+
+        if db_file is None:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            db_file = os.path.join(EXPORT_DIR, "MarketSnapshotTimeSeries.db")
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        self.stats = {feed: {"polls": 0, "not_modified": 0, "unchanged": 0, "changes": 0, "bytes": 0}
+                      for feed in self.feeds}
+
+    def _create_tables(self):
+        for config in FEEDS.values():
+            columns = ",\n".join(f"{name} {sql_type}" for name, sql_type in config["columns"].items())
+            self.conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {config["table"]} (
+                    TIMESTAMP TEXT NOT NULL,
+                    {columns}
+                )
+            """)
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{config['table']}_ts ON {config['table']} (TIMESTAMP)"
+            )
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.STATE_TABLE} (
+                FEED TEXT PRIMARY KEY,
+                ETAG TEXT,
+                LAST_MODIFIED TEXT,
+                PAYLOAD_HASH TEXT,
+                LAST_CHANGE TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def _state(self, feed):
+        row = self.conn.execute(
+            f"SELECT ETAG, LAST_MODIFIED, PAYLOAD_HASH FROM {self.STATE_TABLE} WHERE FEED = ?", (feed,)
+        ).fetchone()
+        return row or (None, None, None)
+
+    def _save_state(self, feed, etag, last_modified, payload_hash, changed_at=None):
+        self.conn.execute(f"""
+            INSERT INTO {self.STATE_TABLE} (FEED, ETAG, LAST_MODIFIED, PAYLOAD_HASH, LAST_CHANGE)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (FEED) DO UPDATE SET
+                ETAG = excluded.ETAG,
+                LAST_MODIFIED = excluded.LAST_MODIFIED,
+                PAYLOAD_HASH = excluded.PAYLOAD_HASH,
+                LAST_CHANGE = COALESCE(excluded.LAST_CHANGE, LAST_CHANGE)
+        """, (feed, etag, last_modified, payload_hash, changed_at))
+
+    @staticmethod
+    def payload_hash(rows):
+        return hashlib.sha256(json.dumps(rows, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+    def poll_feed(self, feed, timestamp=None):
+        """Poll one feed. Returns "changed", "unchanged" or "not-modified"."""
+        config = FEEDS[feed]
+        url, referer = self.endpoints[feed]
+        etag, last_modified, previous_hash = self._state(feed)
+        stats = self.stats[feed]
+        stats["polls"] += 1
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = self.client.get(url, referer=referer, headers=headers, timeout=10)
+        if response.status_code == 304:
+            stats["not_modified"] += 1
+            return "not-modified"
+        response.raise_for_status()
+        stats["bytes"] += len(response.content)
+
+        rows = config["extract"](response.json())
+        current_hash = self.payload_hash(rows)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        if current_hash == previous_hash:
+            stats["unchanged"] += 1
+            self._save_state(feed, etag, last_modified, current_hash)
+            self.conn.commit()
+            return "unchanged"
+
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        placeholders = ", ".join("?" for _ in range(len(config["columns"]) + 1))
+        self.conn.executemany(
+            f"INSERT INTO {config['table']} (TIMESTAMP, {', '.join(config['columns'])}) VALUES ({placeholders})",
+            [(timestamp, *row) for row in rows],
+        )
+        self._save_state(feed, etag, last_modified, current_hash, timestamp)
+        self.conn.commit()
+        stats["changes"] += 1
+        return "changed"
+
+    def poll_once(self):
+        results = {}
+        for feed in self.feeds:
+            try:
+                results[feed] = self.poll_feed(feed)
+            except Exception as e:
+                print(f"❌ [{feed}] Error: {e}")
+                results[feed] = "error"
+        now = datetime.now().strftime("%H:%M:%S")
+        summary = " | ".join(f"{feed}: {result}" for feed, result in results.items())
+        icon = "🔔" if "changed" in results.values() else "⏳"
+        print(f"{icon} {now} {summary}")
+        return results
+
+    def run(self):
+        print(f"🚀 Polling {', '.join(self.feeds)} every {self.interval}s...")
+        next_tick = time.monotonic()
+        while True:
+            self.poll_once()
+            # Fixed cadence: a slow response does not push later polls back
+            next_tick += self.interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+
+    def report(self):
+        for feed, stats in self.stats.items():
+            print(f"📊 {feed}: {stats['polls']} polls, {stats['changes']} stored, "
+                  f"{stats['unchanged']} unchanged, {stats['not_modified']} not modified, "
+                  f"{stats['bytes'] / 1024:.1f} KiB downloaded")
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    poller = MarketSnapshotPoller(interval=60)
+    try:
+        poller.run()
+    except KeyboardInterrupt:
+        print("🛑 Polling stopped.")
+    finally:
+        poller.report()
+        poller.close()
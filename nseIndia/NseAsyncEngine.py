@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Token-bucket rate limiter that can be shared by threads and asyncio tasks."""
+
+    def __init__(self, rate=6.0, capacity=None):
+        self.rate = float(rate)                       # tokens added per second
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take one token and return how many seconds the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AsyncBatchFetcher:
+    """Fan out GET requests over a shared NseClient with a concurrency cap and rate limit."""
+
+    def __init__(self, client, max_concurrency=8, rate=6.0, burst=None):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.limiter = TokenBucket(rate=rate, capacity=burst)
+
+    async def _fetch(self, semaphore, key, path, referer, timeout):
+        async with semaphore:
+            await self.limiter.acquire_async()
+            try:
+                # requests is blocking, so each call runs on a worker thread
+                response = await asyncio.to_thread(self.client.get, path, referer=referer, timeout=timeout)
+                response.raise_for_status()
+                return key, response.json(), None
+            except Exception as e:
+                return key, None, e
+
+    async def fetch_all(self, jobs, referer=None, timeout=10):
+        """jobs: iterable of (key, path). Returns a list of (key, data, error) in job order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self._fetch(semaphore, key, path, referer, timeout) for key, path in jobs)
+        )
+
+    def run(self, jobs, referer=None, timeout=10):
+        """Blocking entry point for callers that are not already inside an event loop."""
+        return asyncio.run(self.fetch_all(jobs, referer=referer, timeout=timeout))
@@ -0,0 +1,132 @@
+﻿import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from getCookiesFromNSEIndia import NSECookieManager, USER_AGENT
+
+try:
+    import brotli  # noqa: F401  (urllib3 only decodes "br" when brotli is installed)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class NseCookieError(requests.exceptions.RequestException):
+    """Session cookies could not be obtained (HTTP bootstrap and browser fallback both failed)."""
+
+
+class NseClient:
+    """Shared keep-alive HTTP client for the nseindia.com API."""
+
+    BASE_URL = "https://www.nseindia.com"
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    DEFAULT_HEADERS = {
+        'accept': '*/*',
+        'accept-encoding': ACCEPT_ENCODING,
+        'accept-language': 'en-GB,en-IN;q=0.9,en-US;q=0.8,en;q=0.7',
+        'priority': 'u=1, i',
+        'referer': 'https://www.nseindia.com/',
+        'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"',
+        'sec-fetch-dest': 'empty',
+        'sec-fetch-mode': 'cors',
+        'sec-fetch-site': 'same-origin',
+        'user-agent': USER_AGENT,
+    }
+
+    def __init__(self, cookie_manager=None, base_url=None, pool_size=10, retries=3,
+                 backoff_factor=0.5, timeout=10):
+        self.cookie_manager = cookie_manager or NSECookieManager()
+        self.base_url = (base_url or os.environ.get("NSE_BASE_URL", self.BASE_URL)).rstrip("/")
+        self.timeout = timeout
+        self._cookies_loaded = False
+        self._cookie_lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update(self.DEFAULT_HEADERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _ensure_cookies(self, cookies=None):
+        """Load the cookie jar once; replace it when fresh cookies are handed in."""
+        with self._cookie_lock:
+            if self._cookies_loaded and cookies is None:
+                return
+            if cookies is None:
+                cookies = self._get_cookies()
+            self.session.cookies.clear()
+            requests.utils.add_dict_to_cookiejar(self.session.cookies, cookies)
+            self._cookies_loaded = True
+
+    def _get_cookies(self, response=None):
+        """Cookies from the manager (fresh ones when `response` shows a stale session).
+
+        Any failure, e.g. WebDriverException or a missing selenium install, is raised as
+        NseCookieError so fetchers that handle RequestException handle it too.
+        """
+        try:
+            if response is not None:
+                return self.cookie_manager.refresh_if_stale(response)
+            return self.cookie_manager.get_cookies()
+        except requests.exceptions.RequestException:
+            raise
+        except Exception as e:
+            raise NseCookieError(f"Could not obtain NSE session cookies: {e}") from e
+
+    def load_cookies(self):
+        """Acquire the session cookies up front (otherwise done lazily on the first request)."""
+        self._ensure_cookies()
+
+    def build_url(self, path):
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}{path}"
+
+    def get(self, path, params=None, referer=None, headers=None, timeout=None):
+        """GET a path (or absolute URL), refreshing cookies once on 401/403."""
+        self._ensure_cookies()
+        request_headers = dict(headers or {})
+        if referer:
+            request_headers['referer'] = self.build_url(referer)
+
+        url = self.build_url(path)
+        timeout = timeout or self.timeout
+        response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        cookies = self._get_cookies(response)
+        if cookies:
+            self._ensure_cookies(cookies)
+            response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+        return response
+
+    def get_json(self, path, params=None, referer=None, timeout=None):
+        response = self.get(path, params=params, referer=referer, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    with NseClient() as client:
+        stats = client.get_json("/api/NextApi/apiClient?functionName=getMarketStatistics")
+        print(stats.get("data", {}).get("snapshotCapitalMarket"))
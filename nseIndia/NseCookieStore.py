@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+
+DEFAULT_COOKIE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nseIndiaCookies.json")
+
+
+class NseCookieStore:
+    """
+    One JSON file holding the NSE session cookies plus when they were saved and when they expire.
+    Writes go through a temp file + os.replace so readers never see a half-written file, a lock
+    file serialises writers across processes, and reads are served from memory until the file changes.
+    """
+
+    # path -> (mtime_ns, record); shared by every store instance in the process
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.path = os.path.abspath(path or os.environ.get("NSE_COOKIE_FILE", DEFAULT_COOKIE_FILE))
+        self.lock_path = self.path + ".lock"
+
+    @contextmanager
+    def lock(self):
+        """Exclusive cross-process lock around a refresh; blocks until it is free."""
+        with open(self.lock_path, "a+b") as handle:
+            if msvcrt:
+                handle.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after ~10s; keep waiting for the other process
+                        continue
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if msvcrt:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def load(self):
+        """Return {"saved_at", "expires_at", "cookies"} or None if there is no readable store."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._cache_lock:
+            cached = self._cache.get(self.path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        try:
+            with open(self.path, "r") as f:
+                record = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not read cookie store {self.path}: {e}")
+            return None
+
+        if isinstance(record, list):
+            # Older files were a bare list of browser cookies without metadata
+            record = {"saved_at": mtime / 1e9, "expires_at": None, "cookies": record}
+
+        with self._cache_lock:
+            self._cache[self.path] = (mtime, record)
+        return record
+
+    def save(self, cookies, expires_at=None):
+        """Atomically replace the store with `cookies` (list of cookie dicts)."""
+        record = {"saved_at": time.time(), "expires_at": expires_at, "cookies": cookies}
+
+        directory = os.path.dirname(self.path)
+        fd, tmp_path = tempfile.mkstemp(prefix=".nseCookies-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(record, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._cache_lock:
+            self._cache[self.path] = (os.stat(self.path).st_mtime_ns, record)
+        print(f"💾 Cookies saved to {self.path}")
+        return record
+
+    @staticmethod
+    def name_values(record):
+        return {cookie["name"]: cookie["value"] for cookie in record["cookies"]}
+
+
+if __name__ == "__main__":
+    record = NseCookieStore().load()
+    if record is None:
+        print("❌ No cookie store found.")
+    else:
+        print(f"✅ {len(record['cookies'])} cookies, saved {time.ctime(record['saved_at'])}, "
+              f"expires {time.ctime(record['expires_at']) if record['expires_at'] else 'unknown'}")
@@ -0,0 +1,92 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from NseClient import NseClient
+from NseOutputSinks import OUTPUT_FORMAT_ENV, SINKS
+from getMarketStatistics import NSEMarketStatisticsExporter
+from getMarketSnapshot import NSEMarketSnapshotFetcher
+from getLiveAnalysisVariations import LiveAnalysisVariationsFetcher
+from getCorporateFilingsAnnouncements import CorporateAnnouncementsFetcher
+from getCorporateFilingsActions import CorporateActionsFetcher
+from getCorporateFilingsBoardMeetings import CorporateBoardMeetingsFetcher
+from getCorporateFilingsFinancialResults import CorporateFinancialResultsFetcher
+from getCorporateFilingsShareholdingPattern import CorporateShareHoldingsFetcher
+from getBroad_Sectoral_IndicesNSE_ import NseTestDataExporter
+
+
+# Dataset name -> fetcher class; every class takes client= and exposes run()
+DATASETS = {
+    "market-statistics": NSEMarketStatisticsExporter,
+    "market-snapshot": NSEMarketSnapshotFetcher,
+    "gainers-loosers": LiveAnalysisVariationsFetcher,
+    "corporate-announcements": CorporateAnnouncementsFetcher,
+    "corporate-actions": CorporateActionsFetcher,
+    "board-meetings": CorporateBoardMeetingsFetcher,
+    "financial-results": CorporateFinancialResultsFetcher,
+    "shareholdings": CorporateShareHoldingsFetcher,
+    "heatmap": NseTestDataExporter,
+}
+
+
+class NseDatasetRunner:
+    """Run several nseIndia exporters in one process over one cookie fetch and one connection pool."""
+
+    def __init__(self, datasets=None, max_workers=6, client=None):
+        self.datasets = list(datasets or DATASETS)
+        unknown = [name for name in self.datasets if name not in DATASETS]
+        if unknown:
+            raise ValueError(f"Unknown dataset(s): {', '.join(unknown)}. Choose from: {', '.join(DATASETS)}")
+
+        self.max_workers = max_workers
+        # Heatmap fans out on its own, so leave headroom in the pool beyond the worker count
+        self.client = client or NseClient(pool_size=max_workers + 10)
+
+    def _run_one(self, name):
+        start = time.perf_counter()
+        fetcher = DATASETS[name](client=self.client)
+        try:
+            fetcher.run()
+        finally:
+            # Fetchers holding a local store (e.g. the variations history) release it here
+            if hasattr(fetcher, "close"):
+                fetcher.close()
+        return time.perf_counter() - start
+
+    def run(self):
+        start = time.perf_counter()
+
+        # Cookies once, before any worker starts
+        self.client.load_cookies()
+        print(f"✅ Cookies ready in {time.perf_counter() - start:.2f}s")
+
+        timings = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._run_one, name): name for name in self.datasets}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    timings[name] = future.result()
+                    print(f"✅ {name} finished in {timings[name]:.2f}s")
+                except Exception as e:
+                    print(f"❌ {name} failed: {e}")
+
+        print(f"⏱️ {len(timings)}/{len(self.datasets)} datasets done in {time.perf_counter() - start:.2f}s")
+        return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run nseIndia exporters in one process.")
+    parser.add_argument("datasets", nargs="*", help=f"datasets to run (default: all). Available: {', '.join(DATASETS)}")
+    parser.add_argument("--workers", type=int, default=6, help="number of datasets fetched concurrently")
+    parser.add_argument("--format", help=f"comma-separated output formats ({', '.join(SINKS)}); "
+                                         f"defaults to ${OUTPUT_FORMAT_ENV} or excel")
+    args = parser.parse_args()
+    if args.format:
+        os.environ[OUTPUT_FORMAT_ENV] = args.format
+
+    runner = NseDatasetRunner(args.datasets or None, max_workers=args.workers)
+    try:
+        runner.run()
+    finally:
+        runner.client.close()
@@ -0,0 +1,212 @@
+import os
+import re
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+
+
+# Comma-separated list of formats every exporter writes, e.g. "parquet" or "parquet,excel".
+# Excel stays the default because the exported workbooks are what people open.
+OUTPUT_FORMAT_ENV = "NSE_OUTPUT_FORMAT"
+DEFAULT_OUTPUT_FORMAT = "excel"
+
+
+def _safe_name(name):
+    return re.sub(r"[^0-9A-Za-z]+", "_", str(name)).strip("_") or "data"
+
+
+def _arrow_ready(df):
+    """Arrow needs string column names and one type per column; mixed object columns become strings."""
+    df = df.reset_index(drop=True)
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns[df.dtypes.to_numpy() == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            df[col] = df[col].map(lambda v: v if v is None or (isinstance(v, float) and np.isnan(v)) else str(v))
+    return df
+
+
+def _excel_sheet_names(names):
+    """Sheet names cut to Excel's 31 characters, with a numeric suffix where two would collide."""
+    used = set()
+    unique = []
+    for name in names:
+        sheet_name = str(name)[:31]
+        counter = 2
+        # Excel compares sheet names case-insensitively
+        while sheet_name.lower() in used:
+            suffix = f"_{counter}"
+            sheet_name = str(name)[:31 - len(suffix)] + suffix
+            counter += 1
+        used.add(sheet_name.lower())
+        unique.append(sheet_name)
+    return unique
+
+
+def _require_pyarrow(fmt):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"{fmt} output needs pyarrow (pip install pyarrow)") from None
+
+
+class ExcelSink:
+    """Human-facing workbook; one sheet per frame."""
+
+    extension = ".xlsx"
+
+    def paths(self, sheet_names, base_path):
+        return [base_path + self.extension]
+
+    def write(self, frames, base_path):
+        path = base_path + self.extension
+        with pd.ExcelWriter(path) as writer:
+            for sheet_name, df in zip(_excel_sheet_names(frames), frames.values()):
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return [path]
+
+
+class _FilePerFrameSink(ABC):
+    """Columnar/text formats hold one table per file, so extra frames get a suffixed file each."""
+
+    extension = None
+
+    def paths(self, sheet_names, base_path):
+        single = len(sheet_names) == 1
+        return [base_path + ("" if single else f"_{_safe_name(name)}") + self.extension for name in sheet_names]
+
+    def write(self, frames, base_path):
+        paths = self.paths(list(frames), base_path)
+        for df, path in zip(frames.values(), paths):
+            self._write_frame(df, path)
+        return paths
+
+    @abstractmethod
+    def _write_frame(self, df, path):
+        """Write one frame to `path`."""
+
+
+class ParquetSink(_FilePerFrameSink):
+    extension = ".parquet"
+
+    def _write_frame(self, df, path):
+        _require_pyarrow("Parquet")
+        _arrow_ready(df).to_parquet(path, index=False, compression="zstd")
+
+
+class FeatherSink(_FilePerFrameSink):
+    """Uncompressed Arrow IPC, readable back with memory mapping (pyarrow.feather.read_table(..., memory_map=True))."""
+
+    extension = ".feather"
+
+    def _write_frame(self, df, path):
+        _require_pyarrow("Feather")
+        _arrow_ready(df).to_feather(path, compression="uncompressed")
+
+
+class CsvSink(_FilePerFrameSink):
+    extension = ".csv"
+
+    def _write_frame(self, df, path):
+        df.to_csv(path, index=False)
+
+
+class SqliteSink:
+    """One database per export, one table per frame (replaced on every write)."""
+
+    extension = ".db"
+
+    def paths(self, sheet_names, base_path):
+        return [base_path + self.extension]
+
+    def write(self, frames, base_path):
+        path = base_path + self.extension
+        conn = sqlite3.connect(path)
+        try:
+            for sheet_name, df in frames.items():
+                table = df.copy()
+                for col in table.columns[table.dtypes.to_numpy() == object]:
+                    # Nested lists/dicts from the API are not bindable parameters
+                    table[col] = table[col].map(
+                        lambda v: str(v) if isinstance(v, (list, dict)) else v)
+                table.to_sql(_safe_name(sheet_name), conn, if_exists="replace", index=False)
+            conn.commit()
+        finally:
+            conn.close()
+        return [path]
+
+
+SINKS = {
+    "excel": ExcelSink,
+    "parquet": ParquetSink,
+    "feather": FeatherSink,
+    "csv": CsvSink,
+    "sqlite": SqliteSink,
+}
+
+
+def output_formats(formats=None):
+    """Formats from the argument, else NSE_OUTPUT_FORMAT, else Excel."""
+    if formats is None:
+        formats = os.environ.get(OUTPUT_FORMAT_ENV, DEFAULT_OUTPUT_FORMAT)
+    if isinstance(formats, str):
+        formats = [fmt.strip().lower() for fmt in formats.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in SINKS]
+    if unknown:
+        raise ValueError(f"Unknown output format(s): {', '.join(unknown)}. Choose from: {', '.join(SINKS)}")
+    return formats
+
+
+def save_frames(data, output_file, formats=None):
+    """
+    Write a DataFrame, or a {sheet name: DataFrame} dict, in every configured format.
+    `output_file` is the exporter's usual path; its extension is swapped per format.
+    Returns the written paths.
+    """
+    frames = data if isinstance(data, dict) else {"Sheet1": data}
+    base_path = os.path.splitext(output_file)[0]
+    paths = []
+    for fmt in output_formats(formats):
+        paths.extend(SINKS[fmt]().write(frames, base_path))
+    return paths
+
+
+def output_paths(output_file, sheet_names=("Sheet1",), formats=None):
+    """The paths save_frames would write for these sheets, without writing anything."""
+    base_path = os.path.splitext(output_file)[0]
+    paths = []
+    for fmt in output_formats(formats):
+        paths.extend(SINKS[fmt]().paths(list(sheet_names), base_path))
+    return paths
+
+
+def benchmark(rows=50000, repeat=3, directory="."):
+    """Compare write times of every available sink on a synthetic F&O-sized table."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "symbol": rng.choice([f"SYM{i}" for i in range(2000)], rows),
+        "series": rng.choice(["EQ", "BE", "SM"], rows),
+        "ltp": rng.random(rows) * 5000,
+        "pChange": rng.normal(0, 2, rows),
+        "tradedQuantity": rng.integers(0, 10_000_000, rows),
+        "lastUpdateTime": "14-Aug-2025 15:30:00",
+    })
+    base_path = os.path.join(directory, "NseOutputSinks_benchmark")
+    for fmt in SINKS:
+        try:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                paths = save_frames(df, base_path + ".xlsx", formats=[fmt])
+            elapsed = (time.perf_counter() - start) / repeat
+        except ImportError as e:
+            print(f"⚠ {fmt:<8} skipped: {e}")
+            continue
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"⏱️ {fmt:<8} {rows} rows: {elapsed * 1000:8.1f} ms, {size / 1024:8.0f} KiB")
+        for path in paths:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,408 @@
+"""
+Local stand-in for www.nseindia.com used by the PYtestDemo benchmarks.
+
+No recorded NSE responses ship with the repo: nseIndia/replayFixtures is empty until
+`python NseReplayServer.py --record` is run from a machine that can reach nseindia.com.
+Until then every endpoint is answered with the synthetic payloads below, which mimic
+the shape and size of the real ones but not their exact contents.
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replayFixtures")
+
+# Query parameters that change from run to run and must not pick a different fixture
+VOLATILE_PARAMS = {"from_date", "to_date", "expiry"}
+
+# Endpoints captured by --record (path relative to https://www.nseindia.com)
+RECORD_PATHS = [
+    "/api/marketStatus",
+    "/api/NextApi/apiClient?functionName=getMarketStatistics",
+    "/api/NextApi/apiClient?functionName=getMarketSnapshot&&type=G",
+    "/api/option-chain-v3?type=Indices&symbol=NIFTY",
+    "/api/heatmap-index?type=Broad%20Market%20Indices",
+    "/api/heatmap-index?type=Sectoral%20Indices",
+    "/api/heatmap-symbols?type=Broad%20Market%20Indices&indices=NIFTY%2050",
+    "/api/live-analysis-variations?index=gainers",
+    "/api/live-analysis-variations?index=loosers",
+    "/api/corporate-announcements?index=equities",
+    "/api/corporates-corporateActions?index=equities",
+    "/api/corporate-board-meetings?index=equities",
+    "/api/corporates-financial-results?index=equities&period=Quarterly",
+    "/api/corporate-share-holdings-master?index=equities",
+    "/api/market-data-pre-open?key=ALL",
+    "/api/market-data-pre-open?key=SME",
+]
+
+
+def fixture_names(path, query):
+    """Candidate fixture file names for a request, most specific first."""
+    slug = path[len("/api/"):].replace("/", "_") if path.startswith("/api/") else path.strip("/")
+    variant = "&".join(f"{key}={value}" for key, value in sorted(query.items())
+                       if key not in VOLATILE_PARAMS and value)
+    names = []
+    if variant:
+        names.append(f"{slug}__{re.sub(r'[^0-9A-Za-z=&_-]+', '_', variant)}.json")
+    names.append(f"{slug}.json")
+    return names
+
+
+# ---- Synthetic payloads, used when no recorded fixture exists -------------------------------------
+
+def _rng(query):
+    return random.Random(json.dumps(query, sort_keys=True))
+
+
+def _stock_rows(rng, count, prefix="SYM"):
+    rows = []
+    for i in range(count):
+        prev = round(rng.uniform(50, 5000), 2)
+        ltp = round(prev * (1 + rng.uniform(-0.08, 0.08)), 2)
+        rows.append({
+            "symbol": f"{prefix}{i}", "series": "EQ",
+            "open_price": prev, "high_price": max(prev, ltp), "low_price": min(prev, ltp),
+            "ltp": ltp, "prev_price": prev, "net_price": round(100 * (ltp - prev) / prev, 2),
+            "trade_quantity": rng.randint(1000, 5_000_000), "turnover": round(ltp * rng.randint(1, 1000), 2),
+            "market_type": "N", "ca_ex_dt": "18-Aug-2025", "ca_purpose": "-",
+            "perChange": round(100 * (ltp - prev) / prev, 2),
+        })
+    return rows
+
+
+def _api_client(query, rng):
+    if query.get("functionName") == "getMarketStatistics":
+        advances = rng.randint(1000, 2000)
+        declines = rng.randint(1000, 2000)
+        return {"data": {
+            "snapshotCapitalMarket": {"total": advances + declines + 100, "advances": advances,
+                                      "declines": declines, "unchange": 100},
+            "asOnDate": datetime.now().strftime("%d-%b-%Y %H:%M"),
+        }}
+    return {"data": {"topGainers": [
+        {"symbol": row["symbol"], "series": "EQ", "openPrice": row["open_price"], "highPrice": row["high_price"],
+         "lowPrice": row["low_price"], "lastPrice": row["ltp"], "previousClose": row["prev_price"],
+         "change": round(row["ltp"] - row["prev_price"], 2), "pchange": row["perChange"],
+         "totalTradedVolume": row["trade_quantity"]}
+        for row in _stock_rows(rng, 20)
+    ]}}
+
+
+def _option_chain(query, rng, strikes=120):
+    spot = 24500.0
+    expiry = query.get("expiry", "21-Aug-2025")
+    data = []
+    for i in range(strikes):
+        strike = spot + 50 * (i - strikes // 2)
+        item = {"strikePrice": strike, "expiryDate": expiry}
+        for leg in ("CE", "PE"):
+            item[leg] = {
+                "strikePrice": strike, "expiryDate": expiry,
+                "openInterest": rng.randint(0, 200000), "changeinOpenInterest": rng.randint(-20000, 20000),
+                "totalTradedVolume": rng.randint(0, 500000), "impliedVolatility": round(rng.uniform(8, 30), 2),
+                "lastPrice": round(rng.uniform(0.05, 800), 2), "change": round(rng.uniform(-50, 50), 2),
+                "buyQuantity1": rng.randint(0, 5000), "buyPrice1": round(rng.uniform(0.05, 800), 2),
+                "sellPrice1": round(rng.uniform(0.05, 800), 2), "sellQuantity1": rng.randint(0, 5000),
+            }
+        data.append(item)
+    return {"records": {"underlyingValue": spot, "expiryDates": [expiry], "data": data}}
+
+
+def _heatmap_index(query, rng):
+    count = 12 if "Broad" in query.get("type", "") else 16
+    return [{"indexName": f"NIFTY INDEX {i}", "last": round(rng.uniform(5000, 50000), 2),
+             "percChange": round(rng.uniform(-3, 3), 2)} for i in range(count)]
+
+
+def _heatmap_symbols(query, rng):
+    # One index answers with an empty list, so the skip of indices without members is exercised
+    if "Sectoral" in query.get("type", "") and query.get("indices", "").endswith(" 15"):
+        return []
+    return [{"symbol": row["symbol"], "lastPrice": row["ltp"], "pChange": row["perChange"]}
+            for row in _stock_rows(rng, 50)]
+
+
+def _live_variations(query, rng):
+    return {bucket: {"data": _stock_rows(rng, count, prefix=bucket[:3])}
+            for bucket, count in (("NIFTY", 10), ("BANKNIFTY", 10), ("NIFTYNEXT50", 10), ("FOSec", 20))}
+
+
+def _dates(rng, fmt, days=90):
+    return (datetime.now() - timedelta(days=rng.randint(0, days), minutes=rng.randint(0, 1440))).strftime(fmt)
+
+
+def _announcements(query, rng, count=200):
+    return [{"symbol": f"SYM{i % 150}", "desc": "Updates", "sm_name": f"Company {i % 150}",
+             "sm_isin": f"INE{i % 150:06d}01", "an_dt": _dates(rng, "%d-%b-%Y %H:%M:%S"),
+             "sort_date": _dates(rng, "%Y-%m-%d %H:%M:%S"), "seq_id": str(100000 + i),
+             "smIndustry": "Finance", "attchmntText": "Intimation under Regulation 30"} for i in range(count)]
+
+
+def _corporate_actions(query, rng, count=150):
+    return [{"symbol": f"SYM{i}", "series": "EQ", "subject": "Dividend - Rs 2 Per Share", "faceVal": "10",
+             "exDate": _dates(rng, "%d-%b-%Y"), "recDate": _dates(rng, "%d-%b-%Y"), "comp": f"Company {i}",
+             "isin": f"INE{i:06d}01"} for i in range(count)]
+
+
+def _board_meetings(query, rng, count=100):
+    return [{"bm_symbol": f"SYM{i}", "bm_date": _dates(rng, "%d-%b-%Y"), "bm_purpose": "Financial Results",
+             "bm_desc": "To consider and approve the financial results", "sm_name": f"Company {i}",
+             "sm_indusrty": "Finance", "bm_timestamp": _dates(rng, "%d-%b-%Y %H:%M:%S")} for i in range(count)]
+
+
+def _financial_results(query, rng, count=300):
+    return [{"symbol": f"SYM{i}", "companyName": f"Company {i}", "industry": "Finance", "audited": "Un-Audited",
+             "cumulative": "Non-cumulative", "consolidated": "Consolidated", "period": "Quarterly",
+             "relatingTo": "First Quarter", "financialYear": "01-Apr-2025 To 31-Mar-2026",
+             "filingDate": _dates(rng, "%d-%b-%Y %H:%M"), "seqNumber": str(500000 + i),
+             "fromDate": "01-Apr-2025", "toDate": "30-Jun-2025"} for i in range(count)]
+
+
+def _shareholdings(query, rng, count=300):
+    return [{"symbol": f"SYM{i}", "name": f"Company {i}", "pr_and_prgrp": f"{rng.uniform(20, 75):.2f}",
+             "public_val": f"{rng.uniform(25, 80):.2f}", "employeeTrusts": "0", "revisedStatus": "-",
+             "date": "30-JUN-2025", "submissionDate": _dates(rng, "%d-%b-%Y").upper(),
+             "broadcastDate": _dates(rng, "%d-%b-%Y %H:%M:%S").upper(), "recordId": str(9000000 + i)}
+            for i in range(count)]
+
+
+def _pre_open(query, rng):
+    # Prices drift every second so consecutive polls of the pre-open session differ
+    drift = random.Random(int(time.time()))
+    count = 30 if query.get("key") == "SME" else 150
+    rows = []
+    for i in range(count):
+        prev_close = round(rng.uniform(50, 5000), 2)
+        iep = round(prev_close * (1 + rng.uniform(-0.03, 0.03) + drift.uniform(-0.005, 0.005)), 2)
+        quantity = rng.randint(100, 500_000) + drift.randint(0, 5_000)
+        buy, sell = rng.randint(0, 200_000), rng.randint(0, 200_000)
+        rows.append({
+            "metadata": {"symbol": f"{query.get('key', 'ALL')[:3]}{i}", "identifier": f"SYM{i}EQN",
+                         "lastPrice": iep, "previousClose": prev_close,
+                         "change": round(iep - prev_close, 2),
+                         "pChange": round(100 * (iep - prev_close) / prev_close, 2),
+                         "finalQuantity": quantity, "totalTurnover": round(iep * quantity, 2)},
+            "detail": {"preOpenMarket": {"IEP": iep, "finalPrice": iep, "finalQuantity": quantity,
+                                         "totalBuyQuantity": buy, "totalSellQuantity": sell,
+                                         "atoBuyQty": rng.randint(0, 1000), "atoSellQty": rng.randint(0, 1000),
+                                         "lastUpdateTime": datetime.now().strftime("%d-%b-%Y %H:%M:%S")}},
+        })
+    return {"advances": sum(r["metadata"]["change"] > 0 for r in rows),
+            "declines": sum(r["metadata"]["change"] < 0 for r in rows),
+            "unchanged": sum(r["metadata"]["change"] == 0 for r in rows), "data": rows}
+
+
+def _market_status(query, rng):
+    return {"marketState": [{"market": "Capital Market", "marketStatus": "Open",
+                             "tradeDate": datetime.now().strftime("%d-%b-%Y %H:%M")}]}
+
+
+SYNTHETIC = {
+    "NextApi_apiClient": _api_client,
+    "option-chain-v3": _option_chain,
+    "heatmap-index": _heatmap_index,
+    "heatmap-symbols": _heatmap_symbols,
+    "live-analysis-variations": _live_variations,
+    "corporate-announcements": _announcements,
+    "corporates-corporateActions": _corporate_actions,
+    "corporate-board-meetings": _board_meetings,
+    "corporates-financial-results": _financial_results,
+    "corporate-share-holdings-master": _shareholdings,
+    "market-data-pre-open": _pre_open,
+    "marketStatus": _market_status,
+}
+
+
+def _session_token(lifetime=3600):
+    """Unsigned JWT-shaped nseappid value whose exp claim the cookie manager can read."""
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b"=").decode()
+    return ".".join([encode({"alg": "none"}), encode({"exp": int(time.time()) + lifetime}), "replay"])
+
+
+# ---- Server ---------------------------------------------------------------------------------------
+
+class NseReplayServer:
+    """
+    Serves recorded API payloads from `fixtures_dir` when present, synthetic ones otherwise.
+
+    Pages outside /api/ set nsit/nseappid cookies, so the HTTP cookie bootstrap works against it.
+    `latency` (+ uniform `jitter`) delays every response; every `throttle_every`-th API request,
+    and a random `throttle_rate` share of them, is answered 429 with Retry-After: 0.
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=0.0, jitter=0.0, throttle_every=0,
+                 throttle_rate=0.0, host="127.0.0.1", port=0, seed=0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_every = throttle_every
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fixture_cache = {}
+        self.stats = {"requests": 0, "api_requests": 0, "throttled": 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"     # keep-alive, like the real site
+            disable_nagle_algorithm = True    # headers and body go out separately; avoid the 40 ms delayed-ACK stall
+
+            def do_GET(self):
+                replay._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _load_fixture(self, path, query):
+        for name in fixture_names(path, query):
+            file_path = os.path.join(self.fixtures_dir, name)
+            if name in self._fixture_cache:
+                return self._fixture_cache[name]
+            if os.path.exists(file_path):
+                with open(file_path, "rb") as f:
+                    body = f.read()
+                self._fixture_cache[name] = body
+                return body
+
+        slug = path[len("/api/"):].replace("/", "_")
+        builder = SYNTHETIC.get(slug)
+        if builder is None:
+            return None
+        return json.dumps(builder(query, _rng(query))).encode("utf-8")
+
+    def _should_throttle(self):
+        with self._lock:
+            self.stats["api_requests"] += 1
+            count = self.stats["api_requests"]
+            throttle = (self.throttle_every and count % self.throttle_every == 0) or \
+                       (self.throttle_rate and self._random.random() < self.throttle_rate)
+            if throttle:
+                self.stats["throttled"] += 1
+            return throttle
+
+    def _handle(self, handler):
+        with self._lock:
+            self.stats["requests"] += 1
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        parts = urlsplit(handler.path)
+        query = dict(parse_qsl(parts.query))
+
+        if not parts.path.startswith("/api/"):
+            body = b"<html><body>NSE replay</body></html>"
+            handler.send_response(200)
+            handler.send_header("Content-Type", "text/html")
+            handler.send_header("Set-Cookie", "nsit=replay; Path=/; HttpOnly")
+            handler.send_header("Set-Cookie", f"nseappid={_session_token()}; Path=/; HttpOnly")
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+            return
+
+        if self._should_throttle():
+            body = b'{"error": "Too Many Requests"}'
+            handler.send_response(429)
+            handler.send_header("Retry-After", "0")
+        else:
+            body = self._load_fixture(parts.path, query)
+            if body is None:
+                body = b'{"error": "No fixture"}'
+                handler.send_response(404)
+            else:
+                handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def replay_client(server, cookie_file, **client_kwargs):
+    """NseClient wired to the replay server, with cookies bootstrapped from it over HTTP."""
+    from NseClient import NseClient
+    from getCookiesFromNSEIndia import NSECookieManager
+
+    cookie_manager = NSECookieManager(url=server.url + "/", cookie_file=cookie_file, bootstrap="http")
+    return NseClient(cookie_manager=cookie_manager, base_url=server.url, **client_kwargs)
+
+
+def record_fixtures(fixtures_dir=FIXTURES_DIR, paths=RECORD_PATHS):
+    """Capture live NSE responses as fixtures (run from a machine that can reach nseindia.com)."""
+    from NseClient import NseClient
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    with NseClient() as client:
+        for path in paths:
+            parts = urlsplit(path)
+            name = fixture_names(parts.path, dict(parse_qsl(parts.query)))[0]
+            try:
+                response = client.get(path, timeout=20)
+                response.raise_for_status()
+                with open(os.path.join(fixtures_dir, name), "wb") as f:
+                    f.write(response.content)
+                print(f"💾 {name} ({len(response.content) / 1024:.1f} KiB)")
+            except Exception as e:
+                print(f"❌ {path}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local NSE stand-in serving recorded or synthetic payloads.")
+    parser.add_argument("--record", action="store_true", help="capture fixtures from nseindia.com and exit")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every Nth API call with 429")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of API calls answered with 429")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+    else:
+        server = NseReplayServer(latency=args.latency, jitter=args.jitter, throttle_every=args.throttle_every,
+                                 throttle_rate=args.throttle_rate, port=args.port)
+        print(f"🚀 NSE replay server on {server.url} (set NSE_BASE_URL={server.url})")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("🛑 Replay server stopped.")
+        finally:
+            server.httpd.server_close()
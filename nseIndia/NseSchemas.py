@@ -0,0 +1,196 @@
+import time
+import numpy as np
+import pandas as pd
+
+
+# Column kinds:
+#   "category"  repeated labels (symbols, series, industries)
+#   "price"     float32 when every value survives the round trip to 2 decimals, else float64
+#   "float"     float64 (percentages, turnover, ratios)
+#   "volume"    int64, nullable Int64 when the column has gaps, float64 if any value is fractional
+#   ("datetime", format)
+#               a column with values not in that format is left as it is, with a warning
+DATE = ("datetime", "%d-%b-%Y")
+DATE_TIME = ("datetime", "%d-%b-%Y %H:%M:%S")
+
+# Placeholders NSE uses for an empty date
+MISSING_VALUES = {"", "-", "NA"}
+
+SCHEMAS = {
+    "live-analysis-variations": {
+        "DIRECTION": "category",
+        "symbol": "category",
+        "series": "category",
+        "market_type": "category",
+        "open_price": "price",
+        "high_price": "price",
+        "low_price": "price",
+        "ltp": "price",
+        "prev_price": "price",
+        "net_price": "float",
+        "perChange": "float",
+        "trade_quantity": "volume",
+        "turnover": "float",
+        "ca_ex_dt": DATE,
+    },
+    "market-snapshot": {
+        "symbol": "category",
+        "series": "category",
+        "openPrice": "price",
+        "highPrice": "price",
+        "lowPrice": "price",
+        "lastPrice": "price",
+        "previousClose": "price",
+        "change": "price",
+        "pchange": "float",
+        "totalTradedVolume": "volume",
+    },
+    "announcements": {
+        "symbol": "category",
+        "sm_name": "category",
+        "smIndustry": "category",
+        "desc": "category",
+        "sm_isin": "category",
+        "an_dt": DATE_TIME,
+        "sort_date": ("datetime", "%Y-%m-%d %H:%M:%S"),
+        "exchdisstime": DATE_TIME,
+        "seq_id": "volume",
+    },
+    "actions": {
+        "symbol": "category",
+        "series": "category",
+        "comp": "category",
+        "isin": "category",
+        "faceVal": "float",
+        "exDate": DATE,
+        "recDate": DATE,
+        "bcStartDate": DATE,
+        "bcEndDate": DATE,
+        "ndStartDate": DATE,
+        "ndEndDate": DATE,
+    },
+    "shareholdings": {
+        "symbol": "category",
+        "name": "category",
+        "revisedStatus": "category",
+        "pr_and_prgrp": "float",
+        "public_val": "float",
+        "employeeTrusts": "float",
+        "date": DATE,
+        "submissionDate": DATE,
+        "revisionDate": DATE,
+        "broadcastDate": DATE_TIME,
+        "systemDate": DATE_TIME,
+        "recordId": "volume",
+    },
+    "financial-results": {
+        "symbol": "category",
+        "companyName": "category",
+        "industry": "category",
+        "audited": "category",
+        "cumulative": "category",
+        "consolidated": "category",
+        "period": "category",
+        "relatingTo": "category",
+        "financialYear": "category",
+        "filingDate": ("datetime", "%d-%b-%Y %H:%M"),
+        "fromDate": DATE,
+        "toDate": DATE,
+    },
+    "board-meetings": {
+        "bm_symbol": "category",
+        "sm_name": "category",
+        "sm_indusrty": "category",
+        "bm_purpose": "category",
+        "bm_date": DATE,
+        "bm_timestamp": DATE_TIME,
+    },
+}
+
+
+def _price(values):
+    numeric = pd.to_numeric(values, errors="coerce").astype("float64")
+    compact = numeric.astype("float32")
+    # Prices are quoted to 2 decimals (0.05 tick); keep float64 if float32 would move them
+    if np.allclose(compact.to_numpy(dtype="float64"), numeric.to_numpy(), rtol=0, atol=0.005, equal_nan=True):
+        return compact
+    return numeric
+
+
+def _volume(values):
+    numeric = pd.to_numeric(values, errors="coerce").astype("float64")
+    # Quantities are whole numbers; keep float64 rather than truncate anything else
+    if not np.all(np.isnan(numeric) | (numeric == np.round(numeric))):
+        return numeric
+    if numeric.isna().any():
+        return numeric.astype("Int64")
+    return numeric.astype("int64")
+
+
+def _datetime(values, fmt):
+    parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+    present = values.notna() & ~values.astype(str).str.strip().isin(MISSING_VALUES)
+    unparsed = present & parsed.isna()
+    if unparsed.any():
+        raise ValueError(f"{int(unparsed.sum())} values do not match {fmt}, e.g. {values[unparsed].iloc[0]!r}")
+    return parsed
+
+
+def cast_column(values, kind):
+    if kind == "category":
+        return values.astype("category")
+    if kind == "price":
+        return _price(values)
+    if kind == "float":
+        return pd.to_numeric(values, errors="coerce").astype("float64")
+    if kind == "volume":
+        return _volume(values)
+    if isinstance(kind, tuple) and kind[0] == "datetime":
+        return _datetime(values, kind[1])
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def apply_schema(df, schema):
+    """Cast the columns of `df` named in the schema (a SCHEMAS key or a dict); others are left as they are."""
+    columns = SCHEMAS[schema] if isinstance(schema, str) else schema
+    for column, kind in columns.items():
+        if column not in df.columns:
+            continue
+        try:
+            df[column] = cast_column(df[column], kind)
+        except (TypeError, ValueError) as e:
+            print(f"[WARNING] Could not cast {column} to {kind}: {e}")
+    return df
+
+
+def typed_frame(records, schema, columns=None):
+    """pd.DataFrame(records) with the endpoint's schema applied at ingestion."""
+    return apply_schema(pd.DataFrame(records, columns=columns), schema)
+
+
+def benchmark(rows=200000, repeat=5):
+    """Memory and groupby time of an accumulated gainers history, inferred vs typed."""
+    rng = np.random.default_rng(0)
+    symbols = [f"SYM{i}" for i in range(500)]
+    records = {
+        "symbol": rng.choice(symbols, rows).astype(object),
+        "series": rng.choice(["EQ", "BE"], rows).astype(object),
+        "ltp": np.round(rng.random(rows) * 5000, 2).astype(str).astype(object),
+        "perChange": np.round(rng.normal(0, 2, rows), 2).astype(object),
+        "trade_quantity": rng.integers(0, 10_000_000, rows).astype(object),
+        "ca_ex_dt": rng.choice(["18-Aug-2025", "22-Aug-2025", "-"], rows).astype(object),
+    }
+    inferred = pd.DataFrame(records)
+    typed = typed_frame(records, "live-analysis-variations")
+
+    for name, df in (("inferred", inferred), ("typed", typed)):
+        memory = df.memory_usage(deep=True).sum() / 2 ** 20
+        start = time.perf_counter()
+        for _ in range(repeat):
+            df.groupby("symbol", observed=True)["trade_quantity"].sum()
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"⏱️ {name:<8} {rows} rows: {memory:7.1f} MiB, groupby {elapsed * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+
+BUILDUP_LABELS = ["Long Build-up", "Short Build-up", "Short Covering", "Long Unwinding"]
+
+ANALYTICS_FIELDS = [
+    "UNDERLYING", "PCR_OI", "PCR_VOLUME", "MAX_PAIN",
+    "ATM_STRIKE", "ATM_CALL_IV", "ATM_PUT_IV", "ATM_IV_SKEW",
+    "CALL_LONG_BUILDUP", "CALL_SHORT_BUILDUP", "CALL_SHORT_COVERING", "CALL_LONG_UNWINDING",
+    "PUT_LONG_BUILDUP", "PUT_SHORT_BUILDUP", "PUT_SHORT_COVERING", "PUT_LONG_UNWINDING",
+]
+
+
+def underlying_value(data):
+    """Spot price reported alongside the option chain, or None."""
+    try:
+        return float(data["records"]["underlyingValue"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _values(df, column):
+    return np.nan_to_num(df[column].to_numpy(dtype=float), nan=0.0)
+
+
+def _ratio(numerator, denominator):
+    return float(numerator / denominator) if denominator else np.nan
+
+
+def put_call_ratio(df):
+    """Put/call ratio on open interest and on traded volume."""
+    pcr_oi = _ratio(_values(df, "PUT_OI").sum(), _values(df, "CALL_OI").sum())
+    pcr_volume = _ratio(_values(df, "PUT_VOLUME").sum(), _values(df, "CALL_VOLUME").sum())
+    return pcr_oi, pcr_volume
+
+
+def max_pain(df):
+    """
+    Strike at which option writers pay out the least, plus the payout at every strike.
+
+    With strikes sorted ascending, the payout at strike K is
+        calls: sum(C_i * (K - S_i)) over S_i < K  = K * cumC - cumCS
+        puts:  sum(P_i * (S_i - K)) over S_i > K  = (totPS - cumPS) - K * (totP - cumP)
+    so a single cumulative-sum pass replaces the O(strikes^2) nested loop.
+    """
+    if df.empty:
+        return np.nan, pd.Series(dtype=float)
+
+    ordered = df.sort_values("STRIKE")
+    strikes = ordered["STRIKE"].to_numpy(dtype=float)
+    call_oi = _values(ordered, "CALL_OI")
+    put_oi = _values(ordered, "PUT_OI")
+
+    cum_call = np.cumsum(call_oi)
+    cum_call_strike = np.cumsum(call_oi * strikes)
+    cum_put = np.cumsum(put_oi)
+    cum_put_strike = np.cumsum(put_oi * strikes)
+
+    call_pain = strikes * cum_call - cum_call_strike
+    put_pain = (cum_put_strike[-1] - cum_put_strike) - strikes * (cum_put[-1] - cum_put)
+    total_pain = call_pain + put_pain
+
+    return float(strikes[np.argmin(total_pain)]), pd.Series(total_pain, index=strikes, name="PAIN")
+
+
+def atm_iv_skew(df, underlying):
+    """ATM strike, call IV, put IV and put-minus-call IV skew at the strike nearest the spot."""
+    if df.empty or underlying is None:
+        return np.nan, np.nan, np.nan, np.nan
+    strikes = df["STRIKE"].to_numpy(dtype=float)
+    atm = int(np.nanargmin(np.abs(strikes - underlying)))
+    call_iv = float(df["CALL_IV"].iloc[atm])
+    put_iv = float(df["PUT_IV"].iloc[atm])
+    return float(strikes[atm]), call_iv, put_iv, put_iv - call_iv
+
+
+def oi_buildup(df):
+    """
+    Classify every strike's CE and PE leg from the sign of price change and OI change:
+    price up + OI up = Long Build-up, price down + OI up = Short Build-up,
+    price up + OI down = Short Covering, price down + OI down = Long Unwinding.
+    """
+    result = pd.DataFrame({"STRIKE": df["STRIKE"].to_numpy(dtype=float)})
+    for leg in ("CALL", "PUT"):
+        price = df[f"{leg}_CHNG"].to_numpy(dtype=float)
+        oi = df[f"{leg}_CHNG_OI"].to_numpy(dtype=float)
+        conditions = [
+            (price > 0) & (oi > 0),
+            (price < 0) & (oi > 0),
+            (price > 0) & (oi < 0),
+            (price < 0) & (oi < 0),
+        ]
+        result[f"{leg}_BUILDUP"] = np.select(conditions, BUILDUP_LABELS, default="")
+    return result
+
+
+def compute_analytics(df, underlying=None):
+    """All per-snapshot metrics as one flat dict keyed by ANALYTICS_FIELDS."""
+    pcr_oi, pcr_volume = put_call_ratio(df)
+    pain_strike, _ = max_pain(df)
+    atm_strike, atm_call_iv, atm_put_iv, skew = atm_iv_skew(df, underlying)
+    buildup = oi_buildup(df)
+
+    summary = {
+        "UNDERLYING": underlying if underlying is not None else np.nan,
+        "PCR_OI": pcr_oi,
+        "PCR_VOLUME": pcr_volume,
+        "MAX_PAIN": pain_strike,
+        "ATM_STRIKE": atm_strike,
+        "ATM_CALL_IV": atm_call_iv,
+        "ATM_PUT_IV": atm_put_iv,
+        "ATM_IV_SKEW": skew,
+    }
+    for leg in ("CALL", "PUT"):
+        counts = buildup[f"{leg}_BUILDUP"].value_counts()
+        for label in BUILDUP_LABELS:
+            key = f"{leg}_" + label.upper().replace("-", "").replace(" ", "_")
+            summary[key] = int(counts.get(label, 0))
+    return summary
+
+
+def format_summary(summary):
+    return (f"PCR(OI) {summary['PCR_OI']:.2f} | PCR(Vol) {summary['PCR_VOLUME']:.2f} | "
+            f"Max Pain {summary['MAX_PAIN']:.0f} | ATM {summary['ATM_STRIKE']:.0f} "
+            f"IV skew {summary['ATM_IV_SKEW']:.2f}")
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+
+def compute_delta(prev_df, curr_df, value_columns):
+    """
+    Vectorized per-strike diff of two chain snapshots.
+
+    Returns a long DataFrame (STRIKE, COLUMN_NAME, VALUE) of the cells that changed,
+    or None when the strike ladder itself changed and a full keyframe is needed.
+    """
+    prev = prev_df.set_index("STRIKE")
+    curr = curr_df.set_index("STRIKE")
+    if len(prev.index) != len(curr.index) or not prev.index.isin(curr.index).all():
+        return None
+
+    before = prev.reindex(curr.index)[value_columns].to_numpy(dtype=float)
+    after = curr[value_columns].to_numpy(dtype=float)
+
+    # NaN == NaN is False, so treat "both missing" as unchanged
+    changed = ~((before == after) | (np.isnan(before) & np.isnan(after)))
+    rows, cols = np.nonzero(changed)
+    return pd.DataFrame({
+        "STRIKE": curr.index.to_numpy(dtype=float)[rows],
+        "COLUMN_NAME": np.asarray(value_columns, dtype=object)[cols],
+        "VALUE": after[rows, cols],
+    })
+
+
+def apply_deltas(base_df, deltas, value_columns):
+    """Apply delta rows (ordered oldest first) on top of a keyframe snapshot."""
+    if deltas is None or deltas.empty:
+        return base_df.copy()
+
+    # Only the latest value of each cell matters
+    latest = deltas.drop_duplicates(subset=["STRIKE", "COLUMN_NAME"], keep="last")
+
+    result = base_df.set_index("STRIKE")
+    values = result[value_columns].to_numpy(dtype=float, copy=True)
+    row_pos = result.index.get_indexer(latest["STRIKE"].to_numpy(dtype=float))
+    col_pos = pd.Index(value_columns).get_indexer(latest["COLUMN_NAME"])
+    valid = (row_pos >= 0) & (col_pos >= 0)
+    values[row_pos[valid], col_pos[valid]] = latest["VALUE"].to_numpy(dtype=float)[valid]
+
+    result[value_columns] = values
+    return result.reset_index()[base_df.columns]
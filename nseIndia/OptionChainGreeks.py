@@ -0,0 +1,186 @@
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+
+SECONDS_PER_YEAR = 365.0 * 24 * 60 * 60
+MARKET_CLOSE = (15, 30)          # NSE F&O contracts expire at the 15:30 close
+MIN_VOL, MAX_VOL = 1e-4, 5.0     # IV search bracket (0.01% .. 500%)
+
+GREEK_COLUMNS = [
+    "CALL_DELTA", "CALL_GAMMA", "CALL_THETA", "CALL_VEGA",
+    "PUT_DELTA", "PUT_GAMMA", "PUT_THETA", "PUT_VEGA",
+]
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def _norm_cdf(x):
+    # Abramowitz & Stegun 26.2.17, |error| < 7.5e-8; NumPy has no vectorized erf
+    t = 1.0 / (1.0 + 0.2316419 * np.abs(x))
+    poly = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    upper = 1.0 - _norm_pdf(x) * poly
+    return np.where(x >= 0, upper, 1.0 - upper)
+
+
+def time_to_expiry(expiry, now=None):
+    """Year fraction from now until 15:30 on the expiry date ("21-Aug-2025")."""
+    now = now or datetime.now()
+    expiry_dt = datetime.strptime(expiry, "%d-%b-%Y").replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1])
+    return max((expiry_dt - now).total_seconds(), 60.0) / SECONDS_PER_YEAR
+
+
+def _d1_d2(spot, strike, t, vol, rate, div_yield):
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(spot / strike) + (rate - div_yield + 0.5 * vol * vol) * t) / (vol * sqrt_t)
+    return d1, d1 - vol * sqrt_t
+
+
+def bs_price(spot, strike, t, vol, is_call, rate=0.065, div_yield=0.0):
+    d1, d2 = _d1_d2(spot, strike, t, vol, rate, div_yield)
+    disc_spot = spot * np.exp(-div_yield * t)
+    disc_strike = strike * np.exp(-rate * t)
+    call = disc_spot * _norm_cdf(d1) - disc_strike * _norm_cdf(d2)
+    put = disc_strike * _norm_cdf(-d2) - disc_spot * _norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def bs_greeks(spot, strike, t, vol, is_call, rate=0.065, div_yield=0.0):
+    """Delta, gamma, theta (per calendar day) and vega (per 1 vol point) for every row at once."""
+    d1, d2 = _d1_d2(spot, strike, t, vol, rate, div_yield)
+    sqrt_t = np.sqrt(t)
+    q_disc = np.exp(-div_yield * t)
+    r_disc = np.exp(-rate * t)
+    pdf_d1 = _norm_pdf(d1)
+
+    delta = np.where(is_call, q_disc * _norm_cdf(d1), q_disc * (_norm_cdf(d1) - 1.0))
+    gamma = q_disc * pdf_d1 / (spot * vol * sqrt_t)
+    vega = spot * q_disc * pdf_d1 * sqrt_t
+
+    common = -spot * q_disc * pdf_d1 * vol / (2.0 * sqrt_t)
+    call_theta = common - rate * strike * r_disc * _norm_cdf(d2) + div_yield * spot * q_disc * _norm_cdf(d1)
+    put_theta = common + rate * strike * r_disc * _norm_cdf(-d2) - div_yield * spot * q_disc * _norm_cdf(-d1)
+    theta = np.where(is_call, call_theta, put_theta)
+
+    return delta, gamma, theta / 365.0, vega / 100.0
+
+
+def implied_volatility(price, spot, strike, t, is_call, rate=0.065, div_yield=0.0, tol=1e-6, max_iter=60):
+    """
+    Vectorized IV solver: Newton steps safeguarded by a bisection bracket, so rows that
+    would overshoot fall back to bisection instead of diverging. Unsolvable rows are NaN.
+    """
+    price = np.asarray(price, dtype=float)
+    strike = np.asarray(strike, dtype=float)
+    is_call = np.asarray(is_call, dtype=bool)
+
+    vol = np.full(price.shape, np.nan)
+
+    # Price must lie strictly between the no-arbitrage bounds to have a solution
+    lower = bs_price(spot, strike, t, np.full(price.shape, MIN_VOL), is_call, rate, div_yield)
+    upper = bs_price(spot, strike, t, np.full(price.shape, MAX_VOL), is_call, rate, div_yield)
+    idx = np.nonzero(np.isfinite(price) & (price > lower) & (price < upper))[0]
+
+    # Iterate only on the rows that are still unsolved
+    lo = np.full(idx.shape, MIN_VOL)
+    hi = np.full(idx.shape, MAX_VOL)
+    guess = np.full(idx.shape, 0.3)
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        k, c, target = strike[idx], is_call[idx], price[idx]
+        diff = bs_price(spot, k, t, guess, c, rate, div_yield) - target
+
+        done = np.abs(diff) < tol
+        vol[idx[done]] = guess[done]
+        keep = ~done
+        idx, k, c, diff = idx[keep], k[keep], c[keep], diff[keep]
+        lo, hi, guess = lo[keep], hi[keep], guess[keep]
+
+        # Narrow the bracket using the sign of the pricing error
+        too_high = diff > 0
+        hi = np.where(too_high, guess, hi)
+        lo = np.where(too_high, lo, guess)
+
+        d1, _ = _d1_d2(spot, k, t, guess, rate, div_yield)
+        vega = spot * np.exp(-div_yield * t) * _norm_pdf(d1) * np.sqrt(t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = guess - diff / vega
+        use_newton = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        guess = np.where(use_newton, newton, 0.5 * (lo + hi))
+
+    # Rows still iterating after max_iter keep their best estimate
+    vol[idx] = guess
+    return vol
+
+
+def add_greeks(df, spot, expiry, rate=0.065, div_yield=0.0, now=None):
+    """
+    Return a copy of a parsed option chain with greeks for every CE/PE strike.
+    Rows where NSE reports IV 0 (or nothing) but has a last price get a solved IV; when
+    the solver fails the reported value is kept and that leg has no greeks.
+    """
+    result = df.copy()
+    if result.empty or spot is None:
+        for column in GREEK_COLUMNS:
+            result[column] = np.nan
+        return result
+
+    t = time_to_expiry(expiry, now)
+    strikes = result["STRIKE"].to_numpy(dtype=float)
+    n = len(result)
+
+    # Stack CE and PE legs so a single pass covers both
+    strike = np.concatenate([strikes, strikes])
+    is_call = np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)])
+    reported = np.concatenate([result["CALL_IV"].to_numpy(dtype=float), result["PUT_IV"].to_numpy(dtype=float)])
+    iv = reported / 100.0
+    ltp = np.concatenate([result["CALL_LTP"].to_numpy(dtype=float), result["PUT_LTP"].to_numpy(dtype=float)])
+
+    missing = ~(iv > 0) & (ltp > 0)
+    if missing.any():
+        iv[missing] = implied_volatility(ltp[missing], spot, strike[missing], t, is_call[missing], rate, div_yield)
+        # Only overwrite what NSE reported where the solver produced a value
+        shown = np.where(missing & np.isfinite(iv), np.round(iv * 100.0, 2), reported)
+        result["CALL_IV"] = shown[:n]
+        result["PUT_IV"] = shown[n:]
+
+    vol = np.where(iv > 0, iv, np.nan)
+    delta, gamma, theta, vega = bs_greeks(spot, strike, t, vol, is_call, rate, div_yield)
+    for leg, part in (("CALL", slice(0, n)), ("PUT", slice(n, 2 * n))):
+        result[f"{leg}_DELTA"] = delta[part]
+        result[f"{leg}_GAMMA"] = gamma[part]
+        result[f"{leg}_THETA"] = theta[part]
+        result[f"{leg}_VEGA"] = vega[part]
+    return result
+
+
+def benchmark(n_strikes=2000, repeat=20):
+    """Time greeks + IV solving for a synthetic chain where every IV is missing."""
+    rng = np.random.default_rng(0)
+    spot = 24500.0
+    strikes = spot + 5.0 * (np.arange(n_strikes) - n_strikes // 2)
+    t = 7 / 365.0
+    true_vol = rng.uniform(0.1, 0.4, n_strikes)
+    df = pd.DataFrame({
+        "STRIKE": strikes,
+        "CALL_IV": 0.0,
+        "PUT_IV": 0.0,
+        "CALL_LTP": bs_price(spot, strikes, t, true_vol, True),
+        "PUT_LTP": bs_price(spot, strikes, t, true_vol, False),
+    })
+    now = datetime.strptime("14-Aug-2025 15:30", "%d-%b-%Y %H:%M")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = add_greeks(df, spot, "21-Aug-2025", now=now)
+    elapsed = (time.perf_counter() - start) / repeat
+    solved = (result["CALL_IV"] > 0).sum() + (result["PUT_IV"] > 0).sum()
+    print(f"⏱️ {n_strikes} strikes (CE+PE): {elapsed * 1000:.2f} ms per tick, {solved} IVs solved")
+
+
+if __name__ == "__main__":
+    benchmark()
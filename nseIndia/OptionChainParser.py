@@ -0,0 +1,102 @@
+import time
+import numpy as np
+import pandas as pd
+
+
+# Output column -> field in the CE / PE leg of an option-chain-v3 record
+CALL_FIELDS = {
+    "CALL_OI": "openInterest",
+    "CALL_CHNG_OI": "changeinOpenInterest",
+    "CALL_VOLUME": "totalTradedVolume",
+    "CALL_IV": "impliedVolatility",
+    "CALL_LTP": "lastPrice",
+    "CALL_CHNG": "change",
+    "CALL_BID_QTY": "buyQuantity1",
+    "CALL_BID": "buyPrice1",
+    "CALL_ASK": "sellPrice1",
+    "CALL_ASK_QTY": "sellQuantity1",
+}
+PUT_FIELDS = {
+    "PUT_BID_QTY": "buyQuantity1",
+    "PUT_BID": "buyPrice1",
+    "PUT_ASK": "sellPrice1",
+    "PUT_ASK_QTY": "sellQuantity1",
+    "PUT_CHNG": "change",
+    "PUT_LTP": "lastPrice",
+    "PUT_IV": "impliedVolatility",
+    "PUT_VOLUME": "totalTradedVolume",
+    "PUT_CHNG_OI": "changeinOpenInterest",
+    "PUT_OI": "openInterest",
+}
+
+# Arrange columns like NSE website
+OPTION_CHAIN_COLUMNS = list(CALL_FIELDS) + ["STRIKE"] + list(PUT_FIELDS)
+
+_MISSING_LEG = {}
+
+
+def _column(legs, field):
+    # None (missing key or JSON null) becomes NaN when cast to float64
+    return np.array([leg.get(field) for leg in legs], dtype=np.float64)
+
+
+def parse_option_chain(data):
+    """Flatten option-chain-v3 records into the NSE-style CALL | STRIKE | PUT table."""
+    if not data or "records" not in data or "data" not in data["records"]:
+        return pd.DataFrame(columns=OPTION_CHAIN_COLUMNS)
+
+    records = data["records"]["data"]
+    calls = [item.get("CE") or _MISSING_LEG for item in records]
+    puts = [item.get("PE") or _MISSING_LEG for item in records]
+
+    columns = {"STRIKE": np.array([item.get("strikePrice") for item in records], dtype=np.float64)}
+    for column, field in CALL_FIELDS.items():
+        columns[column] = _column(calls, field)
+    for column, field in PUT_FIELDS.items():
+        columns[column] = _column(puts, field)
+
+    return pd.DataFrame(columns, columns=OPTION_CHAIN_COLUMNS, copy=False)
+
+
+def _parse_row_by_row(data):
+    """Previous dict-per-row implementation, kept only as the benchmark baseline."""
+    rows = []
+    for item in data["records"]["data"]:
+        ce = item.get("CE", {})
+        pe = item.get("PE", {})
+        row = {column: ce.get(field) for column, field in CALL_FIELDS.items()}
+        row["STRIKE"] = item.get("strikePrice", None)
+        row.update({column: pe.get(field) for column, field in PUT_FIELDS.items()})
+        rows.append(row)
+    return pd.DataFrame(rows)[OPTION_CHAIN_COLUMNS]
+
+
+def _sample_payload(n_strikes):
+    rng = np.random.default_rng(0)
+    fields = set(CALL_FIELDS.values())
+    records = []
+    for i in range(n_strikes):
+        item = {"strikePrice": 20000 + 50 * i, "expiryDate": "21-Aug-2025"}
+        if i % 7:      # some strikes have no CE leg
+            item["CE"] = {field: float(rng.random() * 1000) for field in fields}
+        if i % 11:     # and some have no PE leg
+            item["PE"] = {field: float(rng.random() * 1000) for field in fields}
+        records.append(item)
+    return {"records": {"data": records}}
+
+
+def benchmark(n_strikes=800, repeat=50):
+    """Microbenchmark: vectorized parser vs the old per-row dict loop."""
+    data = _sample_payload(n_strikes)
+    pd.testing.assert_frame_equal(parse_option_chain(data), _parse_row_by_row(data).astype(np.float64))
+
+    for name, func in (("row-by-row", _parse_row_by_row), ("vectorized", parse_option_chain)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(data)
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"⏱️ {name:<11} {n_strikes} strikes: {elapsed * 1000:.2f} ms per parse")
+
+
+if __name__ == "__main__":
+    benchmark()
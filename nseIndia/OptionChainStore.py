@@ -0,0 +1,259 @@
+import sqlite3
+import pandas as pd
+from OptionChainDelta import compute_delta, apply_deltas
+from OptionChainParser import OPTION_CHAIN_COLUMNS
+from OptionChainAnalytics import ANALYTICS_FIELDS
+
+
+VALUE_COLUMNS = [col for col in OPTION_CHAIN_COLUMNS if col != "STRIKE"]
+
+
+class OptionChainStore:
+    """
+    Append-only SQLite store of option chain snapshots keyed by timestamp and strike.
+
+    Every `keyframe_interval` ticks (or when the strike ladder changes) the full chain is
+    written as a keyframe; in between only the changed cells are stored as deltas.
+    """
+
+    TABLE = "option_chain"
+    DELTA_TABLE = "option_chain_delta"
+    TICKS_TABLE = "option_chain_ticks"
+    ANALYTICS_TABLE = "option_chain_analytics"
+
+    def __init__(self, db_file, symbol, expiry, keyframe_interval=20):
+        self.db_file = db_file
+        self.symbol = symbol
+        self.expiry = expiry
+        self.keyframe_interval = keyframe_interval
+
+        self.last_df = None            # latest snapshot, reconstructed state for diffing
+        self._ticks_since_keyframe = 0
+
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")     # appends don't rewrite earlier pages
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        value_columns = ",\n".join(f'"{col}" REAL' for col in VALUE_COLUMNS)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                TIMESTAMP TEXT NOT NULL,
+                SYMBOL TEXT NOT NULL,
+                EXPIRY TEXT NOT NULL,
+                STRIKE REAL NOT NULL,
+                {value_columns},
+                PRIMARY KEY (SYMBOL, EXPIRY, TIMESTAMP, STRIKE)
+            )
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.DELTA_TABLE} (
+                TIMESTAMP TEXT NOT NULL,
+                SYMBOL TEXT NOT NULL,
+                EXPIRY TEXT NOT NULL,
+                STRIKE REAL NOT NULL,
+                COLUMN_NAME TEXT NOT NULL,
+                VALUE REAL,
+                PRIMARY KEY (SYMBOL, EXPIRY, TIMESTAMP, STRIKE, COLUMN_NAME)
+            )
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TICKS_TABLE} (
+                TIMESTAMP TEXT NOT NULL,
+                SYMBOL TEXT NOT NULL,
+                EXPIRY TEXT NOT NULL,
+                KIND TEXT NOT NULL,
+                PRIMARY KEY (SYMBOL, EXPIRY, TIMESTAMP)
+            )
+        """)
+        analytics_columns = ",\n".join(f'"{col}" REAL' for col in ANALYTICS_FIELDS)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.ANALYTICS_TABLE} (
+                TIMESTAMP TEXT NOT NULL,
+                SYMBOL TEXT NOT NULL,
+                EXPIRY TEXT NOT NULL,
+                {analytics_columns},
+                PRIMARY KEY (SYMBOL, EXPIRY, TIMESTAMP)
+            )
+        """)
+        self.conn.commit()
+
+    def append_analytics(self, summary, timestamp):
+        """Store one row of per-tick analytics (PCR, max pain, IV skew, build-up counts)."""
+        columns = ["TIMESTAMP", "SYMBOL", "EXPIRY"] + ANALYTICS_FIELDS
+        values = [timestamp, self.symbol, self.expiry]
+        values += [None if pd.isna(summary.get(col)) else summary.get(col) for col in ANALYTICS_FIELDS]
+        placeholders = ", ".join("?" for _ in columns)
+        column_sql = ", ".join(f'"{col}"' for col in columns)
+        with self.conn:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.ANALYTICS_TABLE} ({column_sql}) VALUES ({placeholders})",
+                values,
+            )
+
+    def load_analytics(self, since=None):
+        query = f"SELECT * FROM {self.ANALYTICS_TABLE} WHERE SYMBOL = ? AND EXPIRY = ?"
+        params = [self.symbol, self.expiry]
+        if since is not None:
+            query += " AND TIMESTAMP >= ?"
+            params.append(since)
+        return pd.read_sql_query(query + " ORDER BY TIMESTAMP", self.conn, params=params)
+
+    def append(self, df, timestamp):
+        """
+        Record one snapshot. Returns "keyframe", "delta", or None when nothing changed.
+        Cost depends only on the size of this snapshot (or its diff), not on history.
+        """
+        df = df.reindex(columns=OPTION_CHAIN_COLUMNS)
+        delta = None
+        if self.last_df is not None:
+            delta = compute_delta(self.last_df, df, VALUE_COLUMNS)
+            if delta is not None and delta.empty:
+                return None
+            if self._ticks_since_keyframe >= self.keyframe_interval:
+                delta = None   # periodic keyframe bounds the cost of reconstruction
+
+        with self.conn:
+            if delta is None:
+                self._write_keyframe(df, timestamp)
+                kind = "keyframe"
+                self._ticks_since_keyframe = 0
+            else:
+                self._write_delta(delta, timestamp)
+                kind = "delta"
+                self._ticks_since_keyframe += 1
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.TICKS_TABLE} (TIMESTAMP, SYMBOL, EXPIRY, KIND) VALUES (?, ?, ?, ?)",
+                (timestamp, self.symbol, self.expiry, kind),
+            )
+
+        self.last_df = df.copy()
+        return kind
+
+    def _write_keyframe(self, df, timestamp):
+        columns = ["TIMESTAMP", "SYMBOL", "EXPIRY"] + OPTION_CHAIN_COLUMNS
+        frame = df.astype(float)
+        frame = frame.astype(object).where(frame.notna(), None)
+        frame.insert(0, "EXPIRY", self.expiry)
+        frame.insert(0, "SYMBOL", self.symbol)
+        frame.insert(0, "TIMESTAMP", timestamp)
+
+        placeholders = ", ".join("?" for _ in columns)
+        column_sql = ", ".join(f'"{col}"' for col in columns)
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {self.TABLE} ({column_sql}) VALUES ({placeholders})",
+            frame.itertuples(index=False, name=None),
+        )
+
+    def _write_delta(self, delta, timestamp):
+        values = delta["VALUE"].astype(object).where(delta["VALUE"].notna(), None)
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {self.DELTA_TABLE} "
+            "(TIMESTAMP, SYMBOL, EXPIRY, STRIKE, COLUMN_NAME, VALUE) VALUES (?, ?, ?, ?, ?, ?)",
+            zip([timestamp] * len(delta), [self.symbol] * len(delta), [self.expiry] * len(delta),
+                delta["STRIKE"].tolist(), delta["COLUMN_NAME"].tolist(), values.tolist()),
+        )
+
+    def timestamps(self):
+        rows = self.conn.execute(
+            f"SELECT TIMESTAMP FROM {self.TICKS_TABLE} WHERE SYMBOL = ? AND EXPIRY = ? ORDER BY TIMESTAMP",
+            (self.symbol, self.expiry),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _load_keyframe(self, timestamp):
+        return pd.read_sql_query(
+            f"SELECT * FROM {self.TABLE} WHERE SYMBOL = ? AND EXPIRY = ? AND TIMESTAMP = ? ORDER BY STRIKE",
+            self.conn, params=[self.symbol, self.expiry, timestamp],
+        )[OPTION_CHAIN_COLUMNS]
+
+    def _load_deltas(self, after, until):
+        return pd.read_sql_query(
+            f"SELECT TIMESTAMP, STRIKE, COLUMN_NAME, VALUE FROM {self.DELTA_TABLE} "
+            "WHERE SYMBOL = ? AND EXPIRY = ? AND TIMESTAMP > ? AND TIMESTAMP <= ? "
+            "ORDER BY TIMESTAMP",
+            self.conn, params=[self.symbol, self.expiry, after, until],
+        )
+
+    def reconstruct(self, timestamp):
+        """Rebuild the full chain as it was at `timestamp` (latest keyframe + later deltas)."""
+        row = self.conn.execute(
+            f"SELECT MAX(TIMESTAMP) FROM {self.TICKS_TABLE} "
+            "WHERE SYMBOL = ? AND EXPIRY = ? AND KIND = 'keyframe' AND TIMESTAMP <= ?",
+            (self.symbol, self.expiry, timestamp),
+        ).fetchone()
+        if row is None or row[0] is None:
+            return pd.DataFrame(columns=OPTION_CHAIN_COLUMNS)
+
+        keyframe_ts = row[0]
+        base = self._load_keyframe(keyframe_ts)
+        return apply_deltas(base, self._load_deltas(keyframe_ts, timestamp), VALUE_COLUMNS)
+
+    def iter_snapshots(self, since=None, until=None):
+        """Yield (timestamp, chain) for every stored tick, rolling deltas forward in one pass."""
+        start = ""
+        if since is not None:
+            # Start from the keyframe at or before `since` rather than from the first tick
+            row = self.conn.execute(
+                f"SELECT MAX(TIMESTAMP) FROM {self.TICKS_TABLE} "
+                "WHERE SYMBOL = ? AND EXPIRY = ? AND KIND = 'keyframe' AND TIMESTAMP <= ?",
+                (self.symbol, self.expiry, since),
+            ).fetchone()
+            start = row[0] or ""
+        ticks = self.conn.execute(
+            f"SELECT TIMESTAMP, KIND FROM {self.TICKS_TABLE} "
+            "WHERE SYMBOL = ? AND EXPIRY = ? AND TIMESTAMP >= ? ORDER BY TIMESTAMP",
+            (self.symbol, self.expiry, start),
+        ).fetchall()
+        current = None
+        for timestamp, kind in ticks:
+            if until is not None and timestamp > until:
+                break
+            if kind == "keyframe":
+                current = self._load_keyframe(timestamp)
+            elif current is None:
+                current = self.reconstruct(timestamp)
+            else:
+                current = apply_deltas(current, self._load_deltas_at(timestamp), VALUE_COLUMNS)
+            if since is None or timestamp >= since:
+                yield timestamp, current
+
+    def _load_deltas_at(self, timestamp):
+        return pd.read_sql_query(
+            f"SELECT STRIKE, COLUMN_NAME, VALUE FROM {self.DELTA_TABLE} "
+            "WHERE SYMBOL = ? AND EXPIRY = ? AND TIMESTAMP = ?",
+            self.conn, params=[self.symbol, self.expiry, timestamp],
+        )
+
+    def load(self, since=None, until=None):
+        """Return all reconstructed snapshots (optionally within [since, until]) as one long frame."""
+        frames = []
+        for timestamp, snapshot in self.iter_snapshots(since=since, until=until):
+            frame = snapshot.copy()
+            frame.insert(0, "EXPIRY", self.expiry)
+            frame.insert(0, "SYMBOL", self.symbol)
+            frame.insert(0, "TIMESTAMP", timestamp)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["TIMESTAMP", "SYMBOL", "EXPIRY"] + OPTION_CHAIN_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def export_to_excel(self, output_file, since=None, until=None, sheet_per_snapshot=False):
+        """On-demand Excel export, written in a single pass."""
+        df = self.load(since=since, until=until)
+        if df.empty:
+            print("⚠ No snapshots stored yet.")
+            return
+
+        with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+            if sheet_per_snapshot:
+                for timestamp, snapshot in df.groupby("TIMESTAMP", sort=True):
+                    sheet_name = timestamp.replace(":", "-").replace(" ", "_")[:31]
+                    snapshot[OPTION_CHAIN_COLUMNS].to_excel(writer, sheet_name=sheet_name, index=False)
+            else:
+                df.to_excel(writer, sheet_name="OptionChain", index=False)
+        print(f"✅ Exported {df['TIMESTAMP'].nunique()} snapshots to {output_file}")
+
+    def close(self):
+        self.conn.close()
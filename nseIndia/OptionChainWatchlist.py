@@ -0,0 +1,81 @@
+import asyncio
+import random
+from NseClient import NseClient
+from NseAsyncEngine import TokenBucket
+from OptionChainMonitor import OptionChainMonitor
+
+
+class OptionChainWatchlist:
+    """Poll several (symbol, expiry) option chains on one event loop over one shared session."""
+
+    def __init__(self, watchlist, client=None, default_interval=60, jitter=0.1,
+                 max_concurrency=4, rate_per_sec=3.0):
+        """
+        watchlist: iterable of (symbol, expiry) or (symbol, expiry, interval_seconds) tuples.
+        jitter: fraction of each interval used to randomise ticks so instruments don't bunch up.
+        """
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.limiter = TokenBucket(rate=rate_per_sec)
+
+        # One client (one cookie fetch, one connection pool) for every instrument
+        self.client = client or NseClient(pool_size=max_concurrency)
+
+        self.monitors = []
+        for entry in watchlist:
+            symbol, expiry = entry[0], entry[1]
+            interval = entry[2] if len(entry) > 2 else default_interval
+            # Each monitor writes to its own store file named after symbol and expiry
+            self.monitors.append(OptionChainMonitor(symbol=symbol, expiry=expiry, interval=interval,
+                                                    client=self.client))
+
+    def _jittered(self, interval):
+        return interval * random.uniform(-self.jitter, self.jitter)
+
+    async def _watch(self, monitor, semaphore):
+        loop = asyncio.get_running_loop()
+
+        # Random phase offset so instruments with the same interval start apart
+        await asyncio.sleep(random.uniform(0, monitor.interval))
+        next_tick = loop.time()
+
+        while True:
+            async with semaphore:
+                await self.limiter.acquire_async()
+                await asyncio.to_thread(monitor.poll_once)
+
+            # Schedule against a fixed cadence so slow responses don't cause drift
+            next_tick += monitor.interval
+            delay = next_tick - loop.time() + self._jittered(monitor.interval)
+            if delay < 0:
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def run_async(self):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        print(f"🚀 Watching {len(self.monitors)} option chains: "
+              + ", ".join(f"{m.symbol} {m.expiry} ({m.interval}s)" for m in self.monitors))
+        await asyncio.gather(*(self._watch(monitor, semaphore) for monitor in self.monitors))
+
+    def run(self):
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("🛑 Watchlist stopped, exporting snapshots to Excel...")
+            self.export_to_excel()
+
+    def export_to_excel(self):
+        for monitor in self.monitors:
+            monitor.export_to_excel()
+            monitor.export_greeks()
+
+
+if __name__ == "__main__":
+    watchlist = OptionChainWatchlist([
+        ("NIFTY", "21-Aug-2025", 30),
+        ("NIFTY", "28-Aug-2025", 60),
+        ("BANKNIFTY", "28-Aug-2025", 30),
+        ("FINNIFTY", "26-Aug-2025", 60),
+    ])
+    watchlist.run()
@@ -0,0 +1,243 @@
+import argparse
+import glob
+import os
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from NseClient import NseClient
+from NseAsyncEngine import AsyncBatchFetcher
+
+
+EXPORT_DIR = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
+
+# key= parameter -> market shown on the pre-open page
+PRE_OPEN_MARKETS = {"ALL": "CM", "SME": "Emerge"}
+
+# Column -> Arrow type of one logged snapshot row
+LOG_COLUMNS = {
+    "TIMESTAMP": "timestamp[s]",
+    "SYMBOL": "string",
+    "PREV_CLOSE": "double",
+    "IEP": "double",
+    "PCHANGE": "double",
+    "FINAL_QUANTITY": "int64",
+    "TOTAL_BUY_QUANTITY": "int64",
+    "TOTAL_SELL_QUANTITY": "int64",
+    "IMBALANCE": "int64",
+    "IEP_CHANGE": "double",
+    "QUANTITY_CHANGE": "int64",
+    "LAST_UPDATE": "string",
+}
+
+
+def snapshot_frame(payload, timestamp):
+    """One row per symbol from a market-data-pre-open payload."""
+    rows = payload.get("data") or []
+    metadata = [row.get("metadata") or {} for row in rows]
+    detail = [(row.get("detail") or {}).get("preOpenMarket") or {} for row in rows]
+
+    def numeric(records, field, dtype):
+        return pd.to_numeric(pd.Series([r.get(field) for r in records], dtype=object), errors="coerce").astype(dtype)
+
+    return pd.DataFrame({
+        "TIMESTAMP": pd.Series(timestamp, index=range(len(rows)), dtype="datetime64[s]"),
+        "SYMBOL": [m.get("symbol") for m in metadata],
+        "PREV_CLOSE": numeric(metadata, "previousClose", "float64"),
+        "IEP": numeric(detail, "IEP", "float64"),
+        "FINAL_QUANTITY": numeric(detail, "finalQuantity", "Int64"),
+        "TOTAL_BUY_QUANTITY": numeric(detail, "totalBuyQuantity", "Int64"),
+        "TOTAL_SELL_QUANTITY": numeric(detail, "totalSellQuantity", "Int64"),
+        "LAST_UPDATE": [d.get("lastUpdateTime") for d in detail],
+    })
+
+
+def with_deltas(current, previous=None):
+    """Add change vs previous close, order imbalance and the moves since the previous snapshot, column-wise."""
+    prev_close = current["PREV_CLOSE"].where(current["PREV_CLOSE"] > 0)
+    current["PCHANGE"] = (current["IEP"] - prev_close) / prev_close * 100
+    current["IMBALANCE"] = current["TOTAL_BUY_QUANTITY"] - current["TOTAL_SELL_QUANTITY"]
+
+    if previous is None:
+        current["IEP_CHANGE"] = np.nan
+        current["QUANTITY_CHANGE"] = pd.array([pd.NA] * len(current), dtype="Int64")
+    else:
+        # Align on symbol with a hash lookup; symbols new in this snapshot get NaN/NA
+        last = previous.drop_duplicates("SYMBOL", keep="last").set_index("SYMBOL")
+        current["IEP_CHANGE"] = current["IEP"] - current["SYMBOL"].map(last["IEP"])
+        current["QUANTITY_CHANGE"] = current["FINAL_QUANTITY"] - current["SYMBOL"].map(last["FINAL_QUANTITY"])
+    return current[list(LOG_COLUMNS)]
+
+
+def has_moves(frame):
+    """False when no symbol's IEP or quantity moved since the previous snapshot."""
+    moved = frame["IEP_CHANGE"].fillna(1).ne(0) | frame["QUANTITY_CHANGE"].fillna(1).ne(0)
+    return bool(moved.any())
+
+
+class PreOpenLog:
+    """
+    Append-only columnar log: an Arrow IPC stream with one record batch per snapshot.
+
+    Each batch is flushed as soon as it is written, so a crash loses at most the snapshot
+    in flight and the file stays readable up to the last complete batch.
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("The pre-open log needs pyarrow (pip install pyarrow)") from None
+
+        self.path = path
+        self.schema = pa.schema([(name, pa.type_for_alias(arrow_type)) for name, arrow_type in LOG_COLUMNS.items()])
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def append(self, frame):
+        import pyarrow as pa
+
+        self._writer.write_batch(pa.RecordBatch.from_pandas(frame, schema=self.schema, preserve_index=False))
+        self._sink.flush()
+
+    def close(self):
+        self._writer.close()
+        self._sink.close()
+
+    @staticmethod
+    def read(paths):
+        """Concatenate the batches of the given logs, stopping at a truncated tail."""
+        import pyarrow as pa
+
+        batches = []
+        for path in paths:
+            with pa.memory_map(path) as source:
+                reader = pa.ipc.open_stream(source)
+                while True:
+                    try:
+                        batches.append(reader.read_next_batch())
+                    except StopIteration:
+                        break
+                    except pa.ArrowInvalid as e:
+                        print(f"[WARNING] {os.path.basename(path)} ends in a partial batch: {e}")
+                        break
+        if not batches:
+            return pd.DataFrame(columns=list(LOG_COLUMNS))
+        return pa.Table.from_batches(batches).to_pandas()
+
+
+class PreOpenMarketCollector:
+    """
+    Poll the pre-open CM and Emerge markets during the 09:00-09:15 session over one shared session.
+
+    Each poll fetches every market at once, computes indicative price/volume moves against the
+    previous snapshot and appends the snapshot to that market's log when anything moved.
+    """
+
+    def __init__(self, keys=tuple(PRE_OPEN_MARKETS), interval=3, start="09:00", end="09:15",
+                 client=None, log_dir=None):
+        self.client = client or NseClient()
+        self.keys = tuple(keys)
+        self.batch_fetcher = AsyncBatchFetcher(self.client, max_concurrency=len(self.keys))
+        self.url_template = "/api/market-data-pre-open?key={key}"
+        self.referer = "/market-data/pre-open-market-cm-and-emerge-market"
+
+        self.interval = interval
+        self.start = datetime.strptime(start, "%H:%M").time()
+        self.end = datetime.strptime(end, "%H:%M").time()
+        self.log_dir = log_dir or os.path.join(EXPORT_DIR, "preOpen")
+
+        self.logs = {}        # key -> PreOpenLog, opened on the first snapshot
+        self.previous = {}    # key -> last logged snapshot
+        self.stats = {key: {"polls": 0, "snapshots": 0, "rows": 0} for key in self.keys}
+
+    def fetch_snapshots(self):
+        """Fetch every market concurrently; returns {key: payload} for the ones that succeeded."""
+        jobs = [(key, self.url_template.format(key=key)) for key in self.keys]
+        data = {}
+        for key, payload, error in self.batch_fetcher.run(jobs, referer=self.referer, timeout=10):
+            if error is not None:
+                print(f"❌ Error fetching pre-open {key}: {error}")
+                continue
+            data[key] = payload
+        return data
+
+    def _log(self, key):
+        if key not in self.logs:
+            os.makedirs(self.log_dir, exist_ok=True)
+            # A restart during the session starts a new segment; load() reads them all
+            name = f"PreOpen_{key}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.arrows"
+            self.logs[key] = PreOpenLog(os.path.join(self.log_dir, name))
+        return self.logs[key]
+
+    def poll_once(self, timestamp=None):
+        timestamp = timestamp or datetime.now().replace(microsecond=0)
+        results = {}
+        for key, payload in self.fetch_snapshots().items():
+            stats = self.stats[key]
+            stats["polls"] += 1
+            frame = with_deltas(snapshot_frame(payload, timestamp), self.previous.get(key))
+            if not has_moves(frame):
+                results[key] = "unchanged"
+                continue
+            self._log(key).append(frame)
+            self.previous[key] = frame
+            stats["snapshots"] += 1
+            stats["rows"] += len(frame)
+            moves = int(frame["IEP_CHANGE"].fillna(0).ne(0).sum())
+            results[key] = f"{len(frame)} rows, {moves} IEP moves"
+
+        summary = " | ".join(f"{PRE_OPEN_MARKETS.get(key, key)}: {result}" for key, result in results.items())
+        print(f"🔔 {timestamp:%H:%M:%S} {summary or 'no data'}")
+        return results
+
+    def run(self):
+        now = datetime.now()
+        start_at = datetime.combine(now.date(), self.start)
+        end_at = datetime.combine(now.date(), self.end)
+        if now >= end_at:
+            print(f"⚠ Pre-open session ended at {self.end:%H:%M}.")
+            return
+        if now < start_at:
+            print(f"⏳ Waiting for the pre-open session at {self.start:%H:%M}...")
+            time.sleep((start_at - now).total_seconds())
+
+        print(f"🚀 Collecting pre-open {', '.join(self.keys)} every {self.interval}s until {self.end:%H:%M}...")
+        next_tick = time.monotonic()
+        while datetime.now() < end_at:
+            self.poll_once()
+            # Fixed cadence: a slow response does not push later polls back
+            next_tick += self.interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+
+    def load(self, key="ALL", day=None):
+        """Every snapshot logged for `key` on `day` (default today) as one DataFrame."""
+        day = (day or datetime.now()).strftime("%Y%m%d")
+        return PreOpenLog.read(sorted(glob.glob(os.path.join(self.log_dir, f"PreOpen_{key}_{day}_*.arrows"))))
+
+    def report(self):
+        for key, stats in self.stats.items():
+            print(f"📊 {key}: {stats['polls']} polls, {stats['snapshots']} snapshots logged, {stats['rows']} rows")
+
+    def close(self):
+        for log in self.logs.values():
+            log.close()
+        self.logs.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect pre-open market snapshots")
+    parser.add_argument("--keys", nargs="+", default=list(PRE_OPEN_MARKETS), choices=list(PRE_OPEN_MARKETS))
+    parser.add_argument("--interval", type=float, default=3, help="seconds between polls")
+    parser.add_argument("--start", default="09:00", help="HH:MM")
+    parser.add_argument("--end", default="09:15", help="HH:MM")
+    args = parser.parse_args()
+
+    collector = PreOpenMarketCollector(keys=args.keys, interval=args.interval, start=args.start, end=args.end)
+    try:
+        collector.run()
+    except KeyboardInterrupt:
+        print("🛑 Collection stopped.")
+    finally:
+        collector.report()
+        collector.close()
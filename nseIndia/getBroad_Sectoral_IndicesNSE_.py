@@ -1,89 +1,35 @@
 ﻿import requests
 import pandas as pd
-import time
 import json
 import os
-from openpyxl import Workbook
-from getCookiesFromNSEIndia import NSECookieManager
+from NseClient import NseClient
+from NseOutputSinks import save_frames
+from NseAsyncEngine import AsyncBatchFetcher
+from HeatmapIndexCache import HeatmapIndexCache
 
 
 class NseTestDataExporter:
 
-    def __init__(self):
-        # --- Step 1: Get cookies safely ---
-        try:
-            cm = NSECookieManager()
-            self.cookies = cm.fetch_and_save_cookies()
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch cookies: {e}")
-            self.cookies = {}
+    def __init__(self, client=None, max_concurrency=8, rate_per_sec=6.0, cache=None):
+        # Shared HTTP client (pool sized for the concurrent heatmap fan-out)
+        self.client = client or NseClient(pool_size=max_concurrency)
+        self.batch_fetcher = AsyncBatchFetcher(self.client, max_concurrency=max_concurrency, rate=rate_per_sec)
+        # Index lists and constituents change rarely; they are served from here until the TTL expires
+        self.cache = cache or HeatmapIndexCache()
 
         self.marketIndices = [
             "Broad Market Indices",
             "Sectoral Indices"
         ]
 
-        # --- Step 2: Load saved cookies from file ---
-        cookie_file = "nseIndiaCookies_name_value.json"
-        if os.path.exists(cookie_file):
-            try:
-                with open(cookie_file, "r") as f:
-                    auth_data = json.load(f)
-            except Exception as e:
-                print(f"[ERROR] Failed to load cookie JSON: {e}")
-                auth_data = {}
-        else:
-            print(f"[WARNING] Cookie file not found: {cookie_file}")
-            auth_data = {}
-
-        # Extract cookies safely
-        def safe_get(key): return auth_data.get(key, "")
-
-        _ga = safe_get("_ga")
-        abck = safe_get("_abck")
-        AKA_A2 = safe_get("AKA_A2")
-        nsit = safe_get("nsit")
-        nseappid = safe_get("nseappid")
-        bm_mi = safe_get("bm_mi")
-        bm_sz = safe_get("bm_sz")
-        ak_bmsc = safe_get("ak_bmsc")
-        _ga_87M7PJ3R97 = safe_get("_ga_87M7PJ3R97")
-        bm_sv = safe_get("bm_sv")
-        RT = safe_get("RT")
-
-        cookie_str = f'_ga={_ga};abck={abck};AKA_A2={AKA_A2};nsit={nsit};nseappid={nseappid};bm_mi={bm_mi};bm_sz={bm_sz};ak_bmsc={ak_bmsc};_ga_87M7PJ3R97={_ga_87M7PJ3R97};bm_sv={bm_sv}'
-
-        self.broad_indices_url_template = "https://www.nseindia.com/api/heatmap-index?type={market_index}"
-        self.gainers_url_template = "https://www.nseindia.com/api/heatmap-symbols?type={market_index}&indices={indices}"
-
-        self.headers_broad_indices = self._make_headers(cookie_str)
-        self.headers_gainers_url = self._make_headers(cookie_str)
-
-        self.payload = {"gainers"}
-        self.session = requests.Session()
-        self.session.headers.update(self.headers_broad_indices)
-
-    def _make_headers(self, cookie_str):
-        return {
-            'accept': '*/*',
-            'accept-language': 'en-GB,en-IN;q=0.9,en-US;q=0.8,en;q=0.7',
-            'priority': 'u=1, i',
-            'referer': 'https://www.nseindia.com/market-data/live-market-indices/heatmap',
-            'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'same-origin',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-            'Cookie': cookie_str
-        }
+        self.broad_indices_url_template = "/api/heatmap-index?type={market_index}"
+        self.gainers_url_template = "/api/heatmap-symbols?type={market_index}&indices={indices}"
+        self.referer = "/market-data/live-market-indices/heatmap"
 
     def fetch_broad_market_indices(self, market_index):
         url = self.broad_indices_url_template.format(market_index=market_index.replace(" ", "%20"))
         try:
-            response = self.session.get(url, timeout=10)
+            response = self.client.get(url, referer=self.referer, timeout=10)
             print(f"Fetching broad market indices for: {market_index} - Status: {response.status_code}")
             response.raise_for_status()
             data = response.json()
@@ -105,33 +51,87 @@ class NseTestDataExporter:
 
         return indices_list
 
-    def fetch_gainers_for_indices(self, market_index, indices_list):
-        all_data = []
-        for index_info in indices_list:
-            index_name = list(index_info.values())[0]
-            url = self.gainers_url_template.format(
-                market_index=market_index.replace(" ", "%20"),
-                indices=index_name.replace(" ", "%20")
-            )
-            try:
-                self.session.headers.update(self.headers_gainers_url)
-                response = self.session.get(url, timeout=10)
-                print(f"Requesting gainers for: {index_name} ({market_index}) - Status: {response.status_code}")
-                response.raise_for_status()
-                gainers_data = response.json()
-            except requests.exceptions.RequestException as e:
-                print(f"[ERROR] Request failed for {index_name}: {e}")
-                continue
-            except json.JSONDecodeError as e:
-                print(f"[ERROR] JSON decode failed for {index_name}: {e}")
+    def broad_market_indices(self, market_index, force_refresh=False):
+        """
+        Index list of a market category. Served from the cache while it is within the TTL (names
+        only, no quotes); otherwise fetched live from heatmap-index and cached again. A stale
+        cached list stands in when the live call fails.
+        """
+        if not force_refresh:
+            cached = self.cache.index_list(market_index)
+            if cached:
+                print(f"♻️ Using the cached index list for {market_index} ({len(cached)} indices)")
+                return cached
+
+        indices_list = self.fetch_broad_market_indices(market_index)
+        if indices_list:
+            self.cache.save_index_list(market_index, indices_list)
+            return indices_list
+        stale = self.cache.index_list(market_index, allow_stale=True)
+        if stale:
+            print(f"[WARNING] Using the expired cached index list for {market_index} (no quotes).")
+        return stale or []
+
+    def _gainers_url(self, market_index, index_name):
+        return self.gainers_url_template.format(
+            market_index=market_index.replace(" ", "%20"),
+            indices=index_name.replace(" ", "%20")
+        )
+
+    def _gainer_rows(self, market_index, index_info, gainers_data):
+        if not isinstance(gainers_data, list):
+            return []
+        return [{**index_info, **row, "MarketIndex": market_index} for row in gainers_data]
+
+    def _fetch_heatmap_symbols(self, keys):
+        """Concurrently fetch heatmap-symbols for (market_index, index_name) keys; failed ones are left out."""
+        jobs = [(key, self._gainers_url(*key)) for key in keys]
+        responses = {}
+        for (market_index, index_name), gainers_data, error in self.batch_fetcher.run(jobs, referer=self.referer):
+            if error is not None:
+                print(f"[ERROR] Request failed for {index_name}: {error}")
                 continue
-
-            if isinstance(gainers_data, list):
-                for row in gainers_data:
-                    all_data.append({**index_info, **row, "MarketIndex": market_index})
-
-            time.sleep(2)  # polite delay
-        return all_data
+            print(f"Received gainers for: {index_name} ({market_index})")
+            responses[(market_index, index_name)] = gainers_data
+        return responses
+
+    def fetch_all_gainers(self, broad_indices_dict, force_refresh=False):
+        """
+        Fetch heatmap-symbols for every index of every market category concurrently.
+
+        Every index is still priced from its own response each run; only indices whose cached
+        member list is empty (NSE has no heatmap for them) are skipped until the entry expires.
+        """
+        index_lookup = {}
+        for market_index, indices_list in broad_indices_dict.items():
+            for index_info in indices_list:
+                index_lookup[(market_index, list(index_info.values())[0])] = index_info
+
+        known_empty = set()
+        if not force_refresh:
+            for market_index in broad_indices_dict:
+                known_empty.update((market_index, index_name)
+                                   for index_name, members in self.cache.known_members(market_index).items()
+                                   if not members)
+
+        requested = [key for key in index_lookup if key not in known_empty]
+        responses = self._fetch_heatmap_symbols(requested)
+
+        self.cache.save_members({
+            key: [row["symbol"] for row in gainers_data]
+            for key, gainers_data in responses.items()
+            if isinstance(gainers_data, list) and all(isinstance(row, dict) and row.get("symbol") for row in gainers_data)
+        })
+
+        gainers_dict = {market_index: [] for market_index in broad_indices_dict}
+        for (market_index, index_name), index_info in index_lookup.items():
+            gainers_data = responses.get((market_index, index_name))
+            if gainers_data is not None:
+                gainers_dict[market_index].extend(self._gainer_rows(market_index, index_info, gainers_data))
+
+        print(f"📊 Heatmap: {len(requested)} heatmap-symbols requests for {len(index_lookup)} indices "
+              f"({len(known_empty)} without members skipped)")
+        return gainers_dict
 
     def export_to_excel(self, broad_indices_dict, gainers_dict, filename="nse_Broad_SectoralIndices_combined_data.xlsx"):
         try:
@@ -139,28 +139,31 @@ class NseTestDataExporter:
             os.makedirs(export_dir, exist_ok=True)  # create folder if it doesn't exist
             file_path = os.path.join(export_dir, filename)
 
-            with pd.ExcelWriter(file_path) as writer:
-                for market_index in self.marketIndices:
-                    pd.DataFrame(broad_indices_dict.get(market_index, [])).to_excel(
-                        writer, sheet_name=f"{market_index}_Broad"[:31], index=False)
-                    pd.DataFrame(gainers_dict.get(market_index, [])).to_excel(
-                        writer, sheet_name=f"{market_index}_Gainers"[:31], index=False)
+            frames = {}
+            for market_index in self.marketIndices:
+                frames[f"{market_index}_Broad"] = pd.DataFrame(broad_indices_dict.get(market_index, []))
+                frames[f"{market_index}_Gainers"] = pd.DataFrame(gainers_dict.get(market_index, []))
+            paths = save_frames(frames, file_path)
 
-            print(f"[SUCCESS] Exported all responses to {file_path}")
+            print(f"[SUCCESS] Exported all responses to {', '.join(paths)}")
         except Exception as e:
-            print(f"[ERROR] Failed to export Excel: {e}")
+            print(f"[ERROR] Failed to export: {e}")
 
 
-    def run(self):
+    def run(self, force_refresh=False):
         broad_indices_dict = {}
-        gainers_dict = {}
         for market_index in self.marketIndices:
-            broad_indices = self.fetch_broad_market_indices(market_index)
-            broad_indices_dict[market_index] = broad_indices
-            gainers_dict[market_index] = self.fetch_gainers_for_indices(market_index, broad_indices)
+            broad_indices_dict[market_index] = self.broad_market_indices(market_index, force_refresh)
+        gainers_dict = self.fetch_all_gainers(broad_indices_dict, force_refresh)
         self.export_to_excel(broad_indices_dict, gainers_dict)
 
+    def close(self):
+        self.cache.close()
+
 
 if __name__ == "__main__":
     exporter = NseTestDataExporter()
-    exporter.run()
+    try:
+        exporter.run()
+    finally:
+        exporter.close()
@@ -1,56 +1,281 @@
 ﻿import time
-import pickle
 import json
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import base64
+import atexit
+import threading
+import requests
+from NseCookieStore import NseCookieStore
 
+# Selenium and webdriver_manager are only imported when the browser fallback is needed,
+# so the HTTP bootstrap works on machines without Chrome.
 
-class NSECookieManager:
-    def __init__(self, url="https://www.nseindia.com/", pkl_file="nseIndiaCookies.pkl"):
-        self.url = url
-        self.pkl_file = pkl_file
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36')
+
+
+class NseWebDriverService:
+    """Long-lived headless Chrome shared by every NSECookieManager in the process."""
+
+    DRIVER_PATH_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chromedriver_path.json")
+    REQUIRED_COOKIES = ("nsit", "nseappid")
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, headless=True):
+        self.headless = headless
         self.driver = None
+        self._lock = threading.Lock()   # one page load at a time on the warm driver
+
+    @classmethod
+    def shared(cls, headless=True):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(headless=headless)
+                atexit.register(cls._shared.shutdown)
+            return cls._shared
+
+    def _driver_path(self, reinstall=False):
+        """Resolve chromedriver once and reuse the path instead of re-checking versions on every start."""
+        if reinstall:
+            # The cached driver no longer matches the installed Chrome
+            try:
+                os.remove(self.DRIVER_PATH_CACHE)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[WARNING] Could not remove cached chromedriver path: {e}")
+        else:
+            try:
+                with open(self.DRIVER_PATH_CACHE, "r") as f:
+                    path = json.load(f).get("path")
+                if path and os.path.exists(path):
+                    return path
+            except (OSError, ValueError):
+                pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        try:
+            with open(self.DRIVER_PATH_CACHE, "w") as f:
+                json.dump({"path": path}, f)
+        except OSError as e:
+            print(f"[WARNING] Could not cache chromedriver path: {e}")
+        return path
+
+    def _start(self):
+        from selenium import webdriver
+        from selenium.common.exceptions import SessionNotCreatedException
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
 
-    def _init_driver(self):
         chrome_options = Options()
-        # chrome_options.add_argument("--headless")  # Uncomment for headless
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()),
-                                       options=chrome_options)
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.page_load_strategy = "eager"  # cookies are set before images/fonts finish
+        try:
+            self.driver = webdriver.Chrome(service=Service(self._driver_path()), options=chrome_options)
+        except SessionNotCreatedException as e:
+            # Usually Chrome updated past the cached chromedriver: reinstall it and retry once
+            print(f"[WARNING] Chrome session not created, reinstalling chromedriver: {e.msg}")
+            self.driver = webdriver.Chrome(service=Service(self._driver_path(reinstall=True)), options=chrome_options)
+
+    def _is_alive(self):
+        from selenium.common.exceptions import WebDriverException
+
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def get_driver(self):
+        """The warm driver, started on first use. Callers must not quit it; use shutdown()."""
+        with self._lock:
+            if not self._is_alive():
+                self._start()
+            return self.driver
+
+    def fetch_cookies(self, url, timeout=15):
+        """Load `url` on the warm driver and return its cookies once the session cookies are set."""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self._lock:
+            if not self._is_alive():
+                self._start()
+
+            # Drop the old session so NSE issues a fresh one
+            self.driver.delete_all_cookies()
+            self.driver.get(url)
+            try:
+                WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                    lambda d: all(d.get_cookie(name) for name in self.REQUIRED_COOKIES)
+                )
+            except TimeoutException:
+                print(f"[WARNING] Session cookies not set after {timeout}s, saving what is available.")
+            return self.driver.get_cookies()
+
+    def shutdown(self):
+        from selenium.common.exceptions import WebDriverException
+
+        with self._lock:
+            if self.driver is not None:
+                try:
+                    self.driver.quit()
+                except WebDriverException:
+                    pass
+                self.driver = None
+
+
+class NSECookieManager:
+    # Cookies whose expiry decides whether the saved session is still usable
+    SESSION_COOKIES = ("nseappid", "bm_sv")
+    REQUIRED_COOKIES = NseWebDriverService.REQUIRED_COOKIES
+    STALE_STATUS_CODES = (401, 403)
+
+    # Plain-HTTP bootstrap: homepage, then a referer page, then an API warm-up call
+    HTTP_BOOTSTRAP_STEPS = (
+        ("/", None, "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"),
+        ("/option-chain", "/", "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"),
+        ("/api/marketStatus", "/option-chain", "*/*"),
+    )
+
+    # Serialises refreshes so concurrent fetchers share one round trip
+    _refresh_lock = threading.Lock()
+
+    def __init__(self, url=None, cookie_file=None, store=None,
+                 expiry_margin=60, headless=True, bootstrap="http"):
+        # NSE_BASE_URL points cookies and API calls at the same host (e.g. the local replay server)
+        self.url = url or os.environ.get("NSE_BASE_URL", "https://www.nseindia.com").rstrip("/") + "/"
+        self.store = store or NseCookieStore(cookie_file)
+        self.expiry_margin = expiry_margin  # seconds of safety before a cookie is treated as expired
+        self.headless = headless
+        self.bootstrap = bootstrap      # "http" tries plain requests first, "browser" goes straight to Chrome
+
+    def _fetch_cookies_via_http(self, timeout=10):
+        """Collect the session cookies with plain HTTP requests, no browser involved."""
+        base_url = self.url.rstrip("/")
+        with requests.Session() as session:
+            session.headers.update({
+                'user-agent': USER_AGENT,
+                'accept-language': 'en-GB,en-IN;q=0.9,en-US;q=0.8,en;q=0.7',
+                'accept-encoding': 'gzip, deflate',
+            })
+            for path, referer, accept in self.HTTP_BOOTSTRAP_STEPS:
+                headers = {'accept': accept}
+                if referer:
+                    headers['referer'] = base_url + referer
+                session.get(base_url + path, headers=headers, timeout=timeout).raise_for_status()
+
+            cookies = [{
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+                **({"expiry": int(cookie.expires)} if cookie.expires else {}),
+            } for cookie in session.cookies]
+
+        missing = [name for name in self.REQUIRED_COOKIES if name not in {c["name"] for c in cookies}]
+        if missing:
+            raise ValueError(f"HTTP bootstrap did not receive: {', '.join(missing)}")
+        return cookies
+
+    def _fetch_cookies(self):
+        if self.bootstrap == "http":
+            try:
+                cookies = self._fetch_cookies_via_http()
+                print("✅ Session cookies obtained over plain HTTP.")
+                return cookies
+            except Exception as e:
+                print(f"[WARNING] HTTP cookie bootstrap failed ({e}), falling back to the browser.")
+        # Visit the site on the shared warm browser
+        return NseWebDriverService.shared(headless=self.headless).fetch_cookies(self.url)
 
     def fetch_and_save_cookies(self):
-        self._init_driver()
+        cookies = self._fetch_cookies()
+        record = self.store.save(cookies, expires_at=self.session_expiry(cookies))
+        return self.store.name_values(record)
+
+    def get_cookies(self, force_refresh=False):
+        """Return name-value cookies, reusing the saved session while it is still valid."""
+        if not force_refresh:
+            cookies = self.load_cached_cookies()
+            if cookies:
+                print("✅ Reusing cached NSE cookies.")
+                return cookies
+
+        requested_at = time.time()
+        with NSECookieManager._refresh_lock, self.store.lock():
+            # Another thread or process may have refreshed while this one waited for the lock
+            record = self.store.load()
+            if record and record.get("saved_at", 0) >= requested_at:
+                cookies = self.load_cached_cookies()
+                if cookies:
+                    return cookies
+            return self.fetch_and_save_cookies()
 
-        # Always start fresh — visit the site
-        self.driver.get(self.url)
-        time.sleep(5)  # Wait for full load
+    def refresh_if_stale(self, response):
+        """Refresh cookies only when a 401/403 proves the session is stale."""
+        if response is not None and response.status_code in self.STALE_STATUS_CODES:
+            print(f"🔄 Session rejected with {response.status_code}, refreshing cookies...")
+            return self.get_cookies(force_refresh=True)
+        return None
 
-        # Save cookies to PKL (overwrite if exists)
-        with open(self.pkl_file, "wb") as file:
-            pickle.dump(self.driver.get_cookies(), file)
-        print(f"Cookies saved to {self.pkl_file}")
+    def load_cached_cookies(self):
+        """Name-value cookies from the store if the session has not expired yet, else None."""
+        record = self.store.load()
+        if not record:
+            return None
 
-        # Read cookies back from PKL
-        with open(self.pkl_file, "rb") as file:
-            cookies = pickle.load(file)
+        expires_at = record.get("expires_at") or self.session_expiry(record["cookies"])
+        if expires_at is None or expires_at - self.expiry_margin <= time.time():
+            return None
+        return self.store.name_values(record)
 
-        # Save full cookies to JSON (overwrite)
-        with open("nseIndiaCookies.json", "w") as json_file:
-            json.dump(cookies, json_file, indent=4)
-        print("Cookies saved to nseIndiaCookies.json")
+    def session_expiry(self, cookies):
+        """Earliest expiry (epoch seconds) of the session cookies, None if nseappid is missing."""
+        by_name = {cookie.get("name"): cookie for cookie in cookies}
+        if "nseappid" not in by_name:
+            return None
+        expiries = []
+        for name in self.SESSION_COOKIES:
+            cookie = by_name.get(name)
+            if cookie is None:
+                # bm_sv is only set by the bot-manager script, so HTTP-bootstrapped sessions lack it
+                continue
+            expiry = cookie.get("expiry")
+            if name == "nseappid":
+                # The JWT carries its own exp claim, which is what the API checks
+                expiry = self._jwt_expiry(cookie.get("value", "")) or expiry
+            if expiry is None:
+                return None
+            expiries.append(expiry)
+        return min(expiries)
 
-        # Save name-value cookies only (overwrite)
-        cookies_name_value = {cookie["name"]: cookie["value"] for cookie in cookies}
-        with open("nseIndiaCookies_name_value.json", "w") as json_file:
-            json.dump(cookies_name_value, json_file, indent=4)
-        print("Saved name-value cookies to nseIndiaCookies_name_value.json")
+    @staticmethod
+    def _jwt_expiry(token):
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        except (IndexError, ValueError):
+            return None
 
-        self.driver.quit()
-        return cookies_name_value
+    @staticmethod
+    def cookie_string(cookies):
+        return ";".join([f"{k}={v}" for k, v in cookies.items()])
 
 
 if __name__ == "__main__":
     cm = NSECookieManager()
-    cm.fetch_and_save_cookies()
+    cm.get_cookies()
@@ -1,71 +1,24 @@
-﻿import requests
-import pandas as pd
-import json
-import os
-from getCookiesFromNSEIndia import NSECookieManager
+﻿import os
+from datetime import datetime, timedelta
+from NseClient import NseClient
+from NseOutputSinks import save_frames, output_paths
+from NseSchemas import typed_frame
+from CorporateFilingsSync import CorporateFilingsSync
 
 
 class CorporateActionsFetcher:
-    def __init__(self):
-        # Step 1: Fetch cookies
-        try:
-            cm = NSECookieManager()
-            self.cookies = cm.fetch_and_save_cookies()
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch cookies: {e}")
-            self.cookies = {}
-
-        # Step 2: Load saved cookies
-        cookie_file = "nseIndiaCookies_name_value.json"
-        try:
-            if os.path.exists(cookie_file):
-                with open(cookie_file, "r") as f:
-                    auth_data = json.load(f)
-            else:
-                print(f"[WARNING] Cookie file not found: {cookie_file}")
-                auth_data = {}
-        except Exception as e:
-            print(f"[ERROR] Failed to load cookie JSON: {e}")
-            auth_data = {}
-
-        # Safe cookie get
-        def safe_get(key):
-            return auth_data.get(key, "")
-
-        cookie_str = ";".join([f"{k}={v}" for k, v in auth_data.items()])
-        self.url = "https://www.nseindia.com/api/corporates-corporateActions?index=equities"
-        self.headers = self._make_headers(cookie_str)
+    def __init__(self, client=None, export_days=90):
+        # Step 1: Shared HTTP client
+        self.client = client or NseClient()
+        self.sync = CorporateFilingsSync(client=self.client)   # local index of filings already seen
+        # The export covers this many days of filings; the full history stays in the store
+        self.export_days = export_days
 
-        # Step 3: Output location
+        # Step 2: Output location
         export_dir = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
         os.makedirs(export_dir, exist_ok=True)
         self.output_file = os.path.join(export_dir, "CorporateActions.xlsx")
 
-    def _make_headers(self, cookie_str):
-        return {
-            'accept': '*/*',
-            'accept-language': 'en-GB,en-IN;q=0.9,en-US;q=0.8,en;q=0.7',
-            'priority': 'u=1, i',
-            'referer': 'https://www.nseindia.com/companies-listing/corporate-filings-actions',
-            'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'same-origin',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-            'Cookie': cookie_str
-        }
-
-    def fetch_data(self):
-        try:
-            response = requests.get(self.url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"❌ Error fetching data: {e}")
-            return None
-
     def save_to_excel(self, data):
         if not data:
             print("⚠ No data to save.")
@@ -73,23 +26,42 @@ class CorporateActionsFetcher:
         try:
             # Handles both list and dict API responses
             if isinstance(data, list):
-                df = pd.DataFrame(data)
+                df = typed_frame(data, "actions")
             elif isinstance(data, dict) and "data" in data:
-                df = pd.DataFrame(data["data"])
+                df = typed_frame(data["data"], "actions")
             else:
                 print("⚠ Unexpected data format.")
                 return
 
-            df.to_excel(self.output_file, index=False)
-            print(f"✅ Data saved to {self.output_file}")
+            paths = save_frames(df, self.output_file)
+            print(f"✅ Data saved to {', '.join(paths)}")
         except Exception as e:
             print(f"❌ Error saving data: {e}")
 
     def run(self):
-        data = self.fetch_data()
-        self.save_to_excel(data)
+        # Only the window since the last sync is fetched
+        try:
+            changed = self.sync.sync("actions")
+        except Exception as e:
+            print(f"❌ Error syncing data: {e}")
+            return
+        # Rebuild when something changed or an output of the configured format(s) is missing
+        if changed or not all(os.path.exists(path) for path in output_paths(self.output_file)):
+            self.save_to_excel(self.sync.load("actions", since=self.export_since()))
+
+    def export_since(self):
+        """Start of the exported window (None exports everything), as compared against FILED_AT."""
+        if self.export_days is None:
+            return None
+        return (datetime.now() - timedelta(days=self.export_days)).strftime("%Y-%m-%d")
+
+    def close(self):
+        self.sync.close()
 
 
 if __name__ == "__main__":
     fetcher = CorporateActionsFetcher()
-    fetcher.run()
+    try:
+        fetcher.run()
+    finally:
+        fetcher.close()
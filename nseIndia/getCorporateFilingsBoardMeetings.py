@@ -1,13 +1,13 @@
-﻿import requests
-import pandas as pd
-import json
-import os
+﻿import os
 from datetime import datetime, timedelta
-from getCookiesFromNSEIndia import NSECookieManager
+from NseClient import NseClient
+from NseOutputSinks import save_frames
+from NseSchemas import typed_frame
+from CorporateFilingsBackfill import backfill_and_save
 
 
 class CorporateBoardMeetingsFetcher:
-    def __init__(self):
+    def __init__(self, client=None):
         # Auto-generate dates: yesterday & today
         today = datetime.now()
         yesterday = today - timedelta(days=1)
@@ -16,64 +16,24 @@ class CorporateBoardMeetingsFetcher:
 
         print(f"📅 Date Range: {self.from_date} to {self.to_date}")
 
-        # Step 1: Fetch cookies
-        try:
-            cm = NSECookieManager()
-            self.cookies = cm.fetch_and_save_cookies()
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch cookies: {e}")
-            self.cookies = {}
-
-        # Step 2: Load saved cookies
-        cookie_file = "nseIndiaCookies_name_value.json"
-        try:
-            if os.path.exists(cookie_file):
-                with open(cookie_file, "r") as f:
-                    auth_data = json.load(f)
-            else:
-                print(f"[WARNING] Cookie file not found: {cookie_file}")
-                auth_data = {}
-        except Exception as e:
-            print(f"[ERROR] Failed to load cookie JSON: {e}")
-            auth_data = {}
-
-        # Build cookie string
-        cookie_str = ";".join([f"{k}={v}" for k, v in auth_data.items()])
+        # Step 1: Shared HTTP client
+        self.client = client or NseClient()
 
-        # Step 3: Prepare URL
+        # Step 2: Prepare URL
         self.url = (
-            "https://www.nseindia.com/api/corporate-board-meetings"
+            "/api/corporate-board-meetings"
             f"?index=equities&from_date={self.from_date}&to_date={self.to_date}"
         )
+        self.referer = "/companies-listing/corporate-filings-board-meetings?equitybmdatefilter=1"
 
-        self.headers = self._make_headers(cookie_str)
-
-        # Step 4: Output location
-        export_dir = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
-        os.makedirs(export_dir, exist_ok=True)
-        self.output_file = os.path.join(export_dir, f"CorporateBoardMeetings_{self.from_date}_to_{self.to_date}.xlsx")
-
-    def _make_headers(self, cookie_str):
-        return {
-            'accept': '*/*',
-            'accept-language': 'en-GB,en-IN;q=0.9,en-US;q=0.8,en;q=0.7',
-            'priority': 'u=1, i',
-            'referer': 'https://www.nseindia.com/companies-listing/corporate-filings-board-meetings?equitybmdatefilter=1',
-            'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Google Chrome";v="138"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'same-origin',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-            'Cookie': cookie_str
-        }
+        # Step 3: Output location
+        self.export_dir = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
+        os.makedirs(self.export_dir, exist_ok=True)
+        self.output_file = os.path.join(self.export_dir, f"CorporateBoardMeetings_{self.from_date}_to_{self.to_date}.xlsx")
 
     def fetch_data(self):
         try:
-            response = requests.get(self.url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(self.url, referer=self.referer, timeout=15)
         except Exception as e:
             print(f"❌ Error fetching data: {e}")
             return None
@@ -84,18 +44,23 @@ class CorporateBoardMeetingsFetcher:
             return
         try:
             if isinstance(data, list):
-                df = pd.DataFrame(data)
+                df = typed_frame(data, "board-meetings")
             elif isinstance(data, dict) and "data" in data:
-                df = pd.DataFrame(data["data"])
+                df = typed_frame(data["data"], "board-meetings")
             else:
                 print("⚠ Unexpected data format.")
                 return
 
-            df.to_excel(self.output_file, index=False)
-            print(f"✅ Data saved to {self.output_file}")
+            paths = save_frames(df, self.output_file)
+            print(f"✅ Data saved to {', '.join(paths)}")
         except Exception as e:
             print(f"❌ Error saving data: {e}")
 
+    def backfill(self, from_date, to_date, window_days=30, max_workers=4, rate_per_sec=2.0):
+        """Fetch a long date range ("dd-mm-yyyy") in concurrent, resumable windows and save the merged result."""
+        return backfill_and_save(self, "board-meetings", "CorporateBoardMeetings", from_date, to_date,
+                                 window_days=window_days, max_workers=max_workers, rate_per_sec=rate_per_sec)
+
     def run(self):
         data = self.fetch_data()
         self.save_to_excel(data)
@@ -0,0 +1,85 @@
+import os
+from datetime import datetime
+from NseClient import NseClient
+from NseAsyncEngine import AsyncBatchFetcher
+from NseOutputSinks import save_frames
+from NseSchemas import typed_frame
+from LiveVariationsHistory import LiveVariationsHistory, VARIATION_BUCKETS
+
+
+class LiveAnalysisVariationsFetcher:
+    """Fetch top gainers and losers concurrently over one session and save them side by side."""
+
+    DIRECTIONS = ("gainers", "loosers")
+
+    def __init__(self, client=None, directions=DIRECTIONS, output_name="LiveAnalysisVariationsData.xlsx"):
+        # Fixed export folder
+        self.export_dir = r"C:\Users\giris\source\repos\nseDemoUemyPythonProject\nseIndia\exportedData"
+        os.makedirs(self.export_dir, exist_ok=True)
+
+        # Shared HTTP client; both directions go out at once under one rate limit
+        self.client = client or NseClient()
+        self.batch_fetcher = AsyncBatchFetcher(self.client, max_concurrency=len(directions))
+        self.history = LiveVariationsHistory()    # every snapshot is kept, the output only holds the latest
+
+        self.directions = tuple(directions)
+        self.url_template = "/api/live-analysis-variations?index={direction}"
+        self.referer = "/market-data/top-gainers-losers"
+        self.output_file = os.path.join(self.export_dir, output_name)
+
+    def fetch_data(self):
+        """Fetch every direction concurrently; returns {direction: payload} for the ones that succeeded."""
+        jobs = [(direction, self.url_template.format(direction=direction)) for direction in self.directions]
+        data = {}
+        for direction, payload, error in self.batch_fetcher.run(jobs, referer=self.referer, timeout=10):
+            if error is not None:
+                print(f"❌ Error fetching {direction}: {error}")
+                continue
+            data[direction] = payload
+        return data
+
+    @staticmethod
+    def to_frames(data):
+        """One DataFrame per bucket with both directions stacked and a DIRECTION column."""
+        frames = {}
+        for bucket, sheet_name in VARIATION_BUCKETS.items():
+            records = []
+            for direction, payload in data.items():
+                for record in (payload.get(bucket) or {}).get("data") or []:
+                    records.append({"DIRECTION": direction, **record})
+            frames[sheet_name] = typed_frame(records, "live-analysis-variations")
+        return frames
+
+    def process_and_save(self, data):
+        """Extract required indices and save them in the configured output format(s)."""
+        if not data:
+            print("⚠ No data to process.")
+            return
+
+        try:
+            paths = save_frames(self.to_frames(data), self.output_file)
+            print(f"✅ Data saved to {', '.join(paths)}")
+        except PermissionError:
+            print(f"❌ Permission denied: Unable to write to {self.output_file}. Is it open?")
+        except Exception as e:
+            print(f"❌ Error processing/saving data: {e}")
+
+    def run(self):
+        """Main execution method."""
+        data = self.fetch_data()
+        # Both directions share one timestamp since they were fetched together
+        timestamp = datetime.now()
+        for direction, payload in data.items():
+            self.history.append(payload, direction, timestamp)
+        self.process_and_save(data)
+
+    def close(self):
+        self.history.close()
+
+
+if __name__ == "__main__":
+    fetcher = LiveAnalysisVariationsFetcher()
+    try:
+        fetcher.run()
+    finally:
+        fetcher.close()